@@ -0,0 +1,22 @@
+# __init__.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+"""Scenario benchmarks for GameGenerator.
+
+Each scenario sets up a real, headless gg.Game (so no window ever shows
+up), plays it for a number of frames with a scripted player, and
+measures how long each frame takes. Run all the scenarios from the
+folder that contains this package with:
+
+    python -m benchmarks
+
+See python -m benchmarks --help for saving the results as JSON and
+comparing them against a stored baseline.
+"""
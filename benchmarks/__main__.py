@@ -0,0 +1,108 @@
+# __main__.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+"""Run the GG scenario benchmarks from the command line."""
+
+import argparse
+import sys
+import benchmarks.runner
+import benchmarks.scenarios
+
+
+def main():
+    """Run the benchmarks, print a table, and check for regressions.
+
+    The exit status is 1 if any regression against the baseline was
+    found, and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description=__doc__)
+    parser.add_argument('-n', '--frames', type=int, default=600,
+                        help='frames to play per scenario (default: 600)')
+    parser.add_argument('-s', '--scenario', action='append',
+                        help='run only this scenario (can be repeated)')
+    parser.add_argument('-o', '--output',
+                        help='save the results to this JSON file')
+    parser.add_argument('-b', '--baseline',
+                        help='compare against the results in this JSON file')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.10,
+                        help='allowed slowdown vs. the baseline '
+                             '(default: 0.10, i.e. 10%%)')
+    parser.add_argument('--no-render', action='store_true',
+                        help="simulate only; don't draw the frames")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="don't measure peak memory (twice as fast)")
+    parser.add_argument('-l', '--list', action='store_true',
+                        help='list the scenarios and exit')
+    args = parser.parse_args()
+
+    scenarios = benchmarks.scenarios.get_scenarios()
+
+    if args.list:
+        for scenario in scenarios:
+            print(scenario.name)
+        return 0
+
+    if args.scenario:
+        known_names = [scenario.name for scenario in scenarios]
+        for name in args.scenario:
+            if name not in known_names:
+                parser.error(''.join(["unknown scenario '", name, "'"]))
+        scenarios = [scenario for scenario in scenarios
+                     if scenario.name in args.scenario]
+
+    results = benchmarks.runner.run_all(
+        scenarios, args.frames, not args.no_render, not args.no_memory,
+        lambda name: print('Running', name, '...', file=sys.stderr))
+    _print_table(results)
+
+    if args.output is not None:
+        benchmarks.runner.save_results(results, args.output)
+
+    if args.baseline is not None:
+        baseline = benchmarks.runner.load_results(args.baseline)
+        regressions = benchmarks.runner.compare(results, baseline,
+                                                args.tolerance)
+        for name, metric, old_value, new_value in regressions:
+            print('REGRESSION:', name, metric,
+                  '{:.3f} -> {:.3f}'.format(old_value, new_value))
+
+        if regressions:
+            return 1
+        print('No regressions against', args.baseline)
+
+    return 0
+
+
+def _print_table(results):
+    """Print the results of every scenario as a table."""
+    row_format = '{:<22}{:>9}{:>9}{:>9}{:>9}{:>12}{:>12}'
+    print(row_format.format('scenario', 'p50 ms', 'p95 ms', 'p99 ms',
+                            'max ms', 'updates/s', 'peak MiB'))
+
+    for name, scenario_results in results['scenarios'].items():
+        peak_memory = scenario_results['peak_memory_bytes']
+        if peak_memory is None:
+            peak_memory = '-'
+        else:
+            peak_memory = '{:.1f}'.format(peak_memory / (1024 * 1024))
+
+        print(row_format.format(
+            name,
+            '{:.3f}'.format(scenario_results['p50_ms']),
+            '{:.3f}'.format(scenario_results['p95_ms']),
+            '{:.3f}'.format(scenario_results['p99_ms']),
+            '{:.3f}'.format(scenario_results['max_ms']),
+            '{:.0f}'.format(scenario_results['updates_per_sec']),
+            peak_memory))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
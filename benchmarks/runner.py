@@ -0,0 +1,179 @@
+# runner.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import json
+import platform
+import time
+import tracemalloc
+import pygame
+import gg
+import benchmarks.scenarios
+
+RESULTS_VERSION = 1
+
+
+def run_scenario(scenario, num_frames, is_rendered=True,
+                 is_memory_measured=True):
+    """Play a scenario and return a dictionary with its measurements.
+
+    A frame is what the real main loop does between two screen updates:
+    handle the input, run the simulation ticks that fit in a frame at the
+    target frame rate, and draw everything (unless is_rendered is false).
+
+    Peak memory is measured with tracemalloc in a second run of the
+    scenario, so that tracing doesn't slow down the timed run. It only
+    counts memory allocated by Python, not the pixels SDL allocates.
+    """
+    frame_times, game = _play_scenario(scenario, num_frames, is_rendered)
+    sorted_times = sorted(frame_times)
+    total_time = sum(frame_times)
+    num_ticks = num_frames * _get_ticks_per_frame(game)
+
+    results = {
+        'frames': num_frames,
+        'ticks': num_ticks,
+        'mean_ms': total_time / num_frames * 1000,
+        'p50_ms': _get_percentile(sorted_times, 0.50) * 1000,
+        'p95_ms': _get_percentile(sorted_times, 0.95) * 1000,
+        'p99_ms': _get_percentile(sorted_times, 0.99) * 1000,
+        'max_ms': sorted_times[-1] * 1000,
+        'updates_per_sec': num_ticks / total_time if total_time > 0 else 0,
+        'peak_memory_bytes': None,
+    }
+
+    if is_memory_measured:
+        tracemalloc.start()
+        try:
+            _play_scenario(scenario, num_frames, is_rendered)
+            results['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return results
+
+
+def run_all(scenarios, num_frames, is_rendered=True, is_memory_measured=True,
+            progress=None):
+    """Run the scenarios and return the full results dictionary.
+
+    If given, progress is called with the name of each scenario before
+    it starts.
+    """
+    results = {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'gg_version': gg.__version__,
+            'pygame_version': pygame.version.ver,
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'is_rendered': is_rendered,
+        },
+        'scenarios': {},
+    }
+
+    for scenario in scenarios:
+        if progress is not None:
+            progress(scenario.name)
+        results['scenarios'][scenario.name] = run_scenario(
+            scenario, num_frames, is_rendered, is_memory_measured)
+
+    return results
+
+
+def compare(results, baseline, tolerance=0.10,
+            metrics=('p50_ms', 'p95_ms', 'p99_ms')):
+    """Compare results against a baseline and return the regressions.
+
+    A regression is a frame-time metric that got worse by more than the
+    tolerance (a fraction; 0.10 means 10%). Each regression is returned
+    as a tuple of the scenario name, the metric, the baseline value,
+    and the new value. Scenarios missing from either side are skipped.
+    """
+    regressions = []
+
+    for name, scenario_results in results['scenarios'].items():
+        baseline_results = baseline.get('scenarios', {}).get(name)
+        if baseline_results is None:
+            continue
+
+        for metric in metrics:
+            old_value = baseline_results.get(metric)
+            new_value = scenario_results.get(metric)
+            if old_value is None or new_value is None:
+                continue
+
+            if new_value > old_value * (1 + tolerance):
+                regressions.append((name, metric, old_value, new_value))
+
+    return regressions
+
+
+def save_results(results, path):
+    """Write the results to a JSON file."""
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """Read results from a JSON file."""
+    with open(path) as file:
+        return json.load(file)
+
+
+def _play_scenario(scenario, num_frames, is_rendered):
+    """Play the scenario and return the frame times and the game."""
+    game = gg.Game()
+    attributes = benchmarks.scenarios.get_default_attributes()
+    attributes.update(scenario.attributes)
+    for name, value in attributes.items():
+        setattr(game, name, value)
+
+    game._init_environment()
+    game._init_new_game()
+
+    if scenario.setup is not None:
+        scenario.setup(game)
+
+    tick_time = 1.0 / game.simulation_rate
+    ticks_per_frame = _get_ticks_per_frame(game)
+    frame_times = []
+    clock = time.perf_counter
+
+    for frame_num in range(num_frames):
+        start_time = clock()
+
+        game._handle_input()
+        if scenario.policy is not None:
+            scenario.policy(game, frame_num)
+
+        for i in range(ticks_per_frame):
+            game._run_tick(tick_time)
+
+        if is_rendered:
+            game._render_frame()
+
+        frame_times.append(clock() - start_time)
+
+    game._quit_pygame()
+    return (frame_times, game)
+
+
+def _get_ticks_per_frame(game):
+    """Return how many simulation ticks the game runs per frame."""
+    return max(1, round(game.simulation_rate / game.TARGET_FPS))
+
+
+def _get_percentile(sorted_values, fraction):
+    """Return a percentile of sorted values, interpolating linearly."""
+    position = fraction * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
@@ -0,0 +1,99 @@
+# scenarios.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import os
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'example_pics')
+
+
+class Scenario:
+    """A scripted game situation to measure.
+
+    -name: unique name used in the results.
+    -attributes: Game attributes to set on top of the benchmark defaults.
+    -setup: optional function called with the game once it's ready.
+    -policy: optional function called with the game and the frame number
+     before every frame to play the part of the player.
+    """
+
+    def __init__(self, name, attributes=None, setup=None, policy=None):
+        """Describe the scenario."""
+        self.name = name
+        self.attributes = {} if attributes is None else attributes
+        self.setup = setup
+        self.policy = policy
+
+
+def get_default_attributes():
+    """Return the Game attributes every scenario starts from."""
+    return {
+        'images_dir': IMAGES_DIR,
+        'player_image': 'guy.gif',
+        'enemy_image': 'face.gif',
+        'missile_image': 'ray.png',
+        'bomb_image': 'bomb.png',
+        'building_image': 'building.png',
+        'building_razed_image': 'building_razed.png',
+        'background_image': 'mountains.BMP',
+        'is_headless': True,
+        'player_num_lives': 0,    # invincible, so the game never ends
+        'seed': 2017,
+    }
+
+
+def _sweep_left_and_right(game, frame_num):
+    """Move the player back and forth across the screen.
+
+    The player waits at the edge of the screen until it's time to turn
+    around, so it's always in reach of the bombs.
+    """
+    is_going_right = (frame_num // 120) % 2 == 0
+    game._set_player_direction(not is_going_right, is_going_right)
+
+
+def _fire_constantly(game, frame_num):
+    """Shoot on every tick while sweeping, reloading when needed."""
+    _sweep_left_and_right(game, frame_num)
+    game._num_pending_shots += 1
+
+    if game._player.shots_left == 0:
+        game._is_reload_pending = True
+
+
+def _raze_all_buildings(game):
+    """Knock down every building before the first frame."""
+    for building in game._building_group.sprites():
+        building.raze()
+        game._static_layer.update_sprite(building)
+
+
+def get_scenarios():
+    """Return the list of all the scenarios, in the order to run them."""
+    scenarios = []
+
+    for enemy_count in (5, 50, 500, 5000):
+        scenarios.append(Scenario(
+            ''.join(['enemies_', str(enemy_count)]),
+            {'enemy_count': enemy_count},
+            policy=_sweep_left_and_right))
+
+    scenarios.append(Scenario(
+        'saturated_fire',
+        {'enemy_count': 50, 'player_num_shots': 0},
+        policy=_fire_constantly))
+
+    scenarios.append(Scenario(
+        'all_buildings_razed',
+        {'enemy_count': 50, 'building_count': 12},
+        setup=_raze_all_buildings,
+        policy=_fire_constantly))
+
+    return scenarios
@@ -0,0 +1,164 @@
+# startup.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+"""Measure how long GG takes to start, from a cold Python process."""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import gg
+import benchmarks.runner
+import benchmarks.scenarios
+
+# What each new process runs; 'import gg' is timed before this module,
+# and everything it imports, is loaded
+_CHILD_CODE = '''
+import time
+start_time = time.perf_counter()
+import gg
+gg.Game
+import_time = time.perf_counter() - start_time
+import benchmarks.startup
+benchmarks.startup._finish_child_run(import_time, {is_headless})
+'''
+
+PHASES = ('import', 'init_environment', 'first_frame', 'total', 'process')
+
+
+def measure_startup(num_runs=10, is_headless=True):
+    """Start GG in new processes and return the full results dictionary.
+
+    Each run times importing gg (and the Game class), initializing the
+    environment (pygame, the screen, and the images of the default
+    benchmark scenario), and creating a new game and drawing its first
+    frame. The total adds those up; the process time is the wall time of
+    the whole process, Python's own startup and shutdown included.
+    """
+    run_times = {phase: [] for phase in PHASES}
+    child_code = _CHILD_CODE.format(is_headless=is_headless)
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    child_env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+
+    for i in range(num_runs):
+        start_time = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', child_code],
+                                cwd=package_dir, env=child_env, check=True,
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+        process_time = time.perf_counter() - start_time
+
+        child_times = json.loads(output.strip().splitlines()[-1])
+        child_times['process'] = process_time
+        for phase in PHASES:
+            run_times[phase].append(child_times[phase])
+
+    results = {
+        'version': benchmarks.runner.RESULTS_VERSION,
+        'meta': {
+            'python_version': sys.version.split()[0],
+            'platform': sys.platform,
+            'runs': num_runs,
+            'is_headless': is_headless,
+        },
+        'scenarios': {},
+    }
+
+    for phase in PHASES:
+        sorted_times = sorted(run_times[phase])
+        results['scenarios'][''.join(['startup_', phase])] = {
+            'runs': num_runs,
+            'mean_ms': sum(sorted_times) / num_runs * 1000,
+            'p50_ms': benchmarks.runner._get_percentile(sorted_times,
+                                                        0.50) * 1000,
+            'max_ms': sorted_times[-1] * 1000,
+        }
+
+    return results
+
+
+def _finish_child_run(import_time, is_headless):
+    """Time the rest of the startup and print the times as JSON."""
+    game = gg.Game()
+    for name, value in benchmarks.scenarios.get_default_attributes().items():
+        setattr(game, name, value)
+    game.is_headless = is_headless
+
+    start_time = time.perf_counter()
+    game._init_environment()
+    init_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    game._init_new_game()
+    game._render_frame()
+    first_frame_time = time.perf_counter() - start_time
+
+    print(json.dumps({
+        'import': import_time,
+        'init_environment': init_time,
+        'first_frame': first_frame_time,
+        'total': import_time + init_time + first_frame_time,
+    }))
+
+
+def main():
+    """Measure the startup, print it, and check for regressions.
+
+    The exit status is 1 if any regression against the baseline was
+    found, and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup',
+                                     description=__doc__)
+    parser.add_argument('-n', '--runs', type=int, default=10,
+                        help='processes to start (default: 10)')
+    parser.add_argument('-o', '--output',
+                        help='save the results to this JSON file')
+    parser.add_argument('-b', '--baseline',
+                        help='compare against the results in this JSON file')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.10,
+                        help='allowed slowdown vs. the baseline '
+                             '(default: 0.10, i.e. 10%%)')
+    parser.add_argument('--window', action='store_true',
+                        help='open a real window instead of running '
+                             'headless')
+    args = parser.parse_args()
+
+    results = measure_startup(args.runs, not args.window)
+
+    row_format = '{:<26}{:>10}{:>10}{:>10}'
+    print(row_format.format('phase', 'mean ms', 'p50 ms', 'max ms'))
+    for name, phase_results in results['scenarios'].items():
+        print(row_format.format(name,
+                                '{:.1f}'.format(phase_results['mean_ms']),
+                                '{:.1f}'.format(phase_results['p50_ms']),
+                                '{:.1f}'.format(phase_results['max_ms'])))
+
+    if args.output is not None:
+        benchmarks.runner.save_results(results, args.output)
+
+    if args.baseline is not None:
+        baseline = benchmarks.runner.load_results(args.baseline)
+        regressions = benchmarks.runner.compare(results, baseline,
+                                                args.tolerance, ('p50_ms',))
+        for name, metric, old_value, new_value in regressions:
+            print('REGRESSION:', name, metric,
+                  '{:.3f} -> {:.3f}'.format(old_value, new_value))
+
+        if regressions:
+            return 1
+        print('No regressions against', args.baseline)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+# sweep.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+"""Play automated games over combinations of settings, one per core."""
+
+import argparse
+import concurrent.futures
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+import gg
+import benchmarks.runner
+import benchmarks.scenarios
+
+# The Game attributes that can be swept, with the type of their values
+PARAMETERS = (
+    ('enemy_speed', float),
+    ('enemy_count', int),
+    ('bomb_speed', float),
+    ('missile_speed', float),
+    ('player_num_shots', int),
+)
+
+RESULT_FIELDS = ('score', 'survival_time', 'is_game_over', 'frames',
+                 'mean_frame_ms', 'p95_frame_ms', 'max_frame_ms')
+
+
+def get_combinations(values):
+    """Return every combination of the parameter values as a list.
+
+    The values are a dictionary of lists by parameter name; each
+    combination is a dictionary with one value per parameter.
+    """
+    names = [name for name, value_type in PARAMETERS if name in values]
+    return [dict(zip(names, combination)) for combination
+            in itertools.product(*[values[name] for name in names])]
+
+
+def play_game(parameters, policy_name='random', seed=0, max_time=120.0):
+    """Play a headless game and return a dictionary with how it went.
+
+    The game is played with the parameters given on top of the
+    benchmark defaults, by the named policy (see POLICIES), until the
+    player or every building is gone or max_time seconds of game time
+    have passed. The player has the usual three lives. The seed drives
+    both the game and the policy, so the same arguments always give the
+    same game.
+
+    The result has the fields in RESULT_FIELDS. The survival time is in
+    seconds of game time; the frame times, in wall time, measure how
+    long the simulation of each frame took.
+    """
+    game = gg.Game()
+    attributes = benchmarks.scenarios.get_default_attributes()
+    attributes.update({'player_num_lives': 3, 'seed': seed})
+    attributes.update(parameters)
+    for name, value in attributes.items():
+        setattr(game, name, value)
+
+    game._init_environment()
+    game._init_new_game()
+
+    policy = POLICIES[policy_name](random.Random(seed))
+    tick_time = 1.0 / game.simulation_rate
+    ticks_per_frame = benchmarks.runner._get_ticks_per_frame(game)
+    max_frames = int(max_time / (tick_time * ticks_per_frame))
+    frame_times = []
+    clock = time.perf_counter
+
+    for frame_num in range(max_frames):
+        start_time = clock()
+
+        game._handle_input()
+        policy(game, frame_num)
+        for i in range(ticks_per_frame):
+            game._run_tick(tick_time)
+
+        frame_times.append(clock() - start_time)
+
+        if not game._player.is_alive or game._buildings_left <= 0:
+            break
+
+    game._quit_pygame()
+
+    sorted_times = sorted(frame_times)
+    return {
+        'score': game._score,
+        'survival_time': game._tick_index * tick_time,
+        'is_game_over': (not game._player.is_alive or
+                         game._buildings_left <= 0),
+        'frames': len(frame_times),
+        'mean_frame_ms': sum(frame_times) / len(frame_times) * 1000,
+        'p95_frame_ms': benchmarks.runner._get_percentile(sorted_times,
+                                                          0.95) * 1000,
+        'max_frame_ms': sorted_times[-1] * 1000,
+    }
+
+
+def run_sweep(combinations, num_games=10, policy_name='random',
+              max_time=120.0, max_workers=None, first_seed=0,
+              progress=None):
+    """Play num_games games per combination and return a row per game.
+
+    The games are spread over a pool of max_workers processes, one per
+    CPU core by default. Game i of every combination gets the seed
+    first_seed + i, so all combinations face the same luck. Each row is
+    a dictionary with the parameters, the policy, the seed, and the
+    result of play_game(), in the order of the combinations.
+
+    If given, progress is called with the number of games done and the
+    total after each game.
+    """
+    jobs = [(combination, policy_name, first_seed + i, max_time)
+            for combination in combinations for i in range(num_games)]
+    results = [None] * len(jobs)
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(play_game, *job): job_num
+                   for job_num, job in enumerate(jobs)}
+
+        for num_done, future in enumerate(
+                concurrent.futures.as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress is not None:
+                progress(num_done, len(jobs))
+
+    rows = []
+    for (combination, policy_name, seed, max_time), result in zip(jobs,
+                                                                  results):
+        row = dict(combination, policy=policy_name, seed=seed)
+        row.update(result)
+        rows.append(row)
+
+    return rows
+
+
+def summarize(rows):
+    """Return a row per combination with the averages of its games.
+
+    Each summary has the parameters, the number of games, the mean and
+    worst score, the mean survival time, the fraction of games lost, the
+    mean frame time, the mean of the games' 95th percentile frame times,
+    and the worst frame time of all.
+    """
+    names = [name for name, value_type in PARAMETERS if name in rows[0]]
+    games_by_combination = {}
+    for row in rows:
+        key = tuple(row[name] for name in names)
+        games_by_combination.setdefault(key, []).append(row)
+
+    summaries = []
+    for key, games in games_by_combination.items():
+        num_games = len(games)
+        summary = dict(zip(names, key))
+        summary.update({
+            'games': num_games,
+            'mean_score': sum(game['score'] for game in games) / num_games,
+            'min_score': min(game['score'] for game in games),
+            'mean_survival_time': sum(game['survival_time']
+                                      for game in games) / num_games,
+            'game_over_rate': sum(1 for game in games
+                                  if game['is_game_over']) / num_games,
+            'mean_frame_ms': sum(game['mean_frame_ms']
+                                 for game in games) / num_games,
+            'p95_frame_ms': sum(game['p95_frame_ms']
+                                for game in games) / num_games,
+            'max_frame_ms': max(game['max_frame_ms'] for game in games),
+        })
+        summaries.append(summary)
+
+    return summaries
+
+
+def save_rows(rows, path):
+    """Write rows of results to a CSV file, one line per row."""
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _init_worker():
+    """Get a worker process ready to play games without a window."""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+
+def _get_random_policy(rng):
+    """Return a policy that moves, shoots, and reloads at random."""
+    direction = 0
+
+    def play(game, frame_num):
+        nonlocal direction
+        player = game._player
+
+        # The keyboard stops the player every frame, so keep it going
+        if frame_num % 15 == 0:
+            direction = rng.choice((-1, 0, 1))
+        game._set_player_direction(direction < 0, direction > 0)
+
+        if rng.random() < 0.1:
+            game._num_pending_shots += 1
+        if player.shots_left == 0 and rng.random() < 0.05:
+            game._is_reload_pending = True
+
+    return play
+
+
+def _get_sweeping_policy(rng):
+    """Return a policy that sweeps the screen, shooting at a steady pace.
+
+    It starts at a random point of its sweep, so games with different
+    seeds differ.
+    """
+    start_frame = rng.randrange(240)
+
+    def play(game, frame_num):
+        frame_num += start_frame
+        player = game._player
+        is_going_right = (frame_num // 120) % 2 == 0
+        game._set_player_direction(not is_going_right, is_going_right)
+
+        if frame_num % 10 == 0:
+            game._num_pending_shots += 1
+        if player.shots_left == 0:
+            game._is_reload_pending = True
+
+    return play
+
+
+# Functions that make a policy from a random number generator, by name;
+# a policy is called with the game and the frame number before every
+# frame to play the part of the player
+POLICIES = {
+    'random': _get_random_policy,
+    'sweep': _get_sweeping_policy,
+}
+
+
+def _format_cell(value):
+    """Return a value of the summary table, padded to its column."""
+    if isinstance(value, float):
+        return '{:>14.2f}'.format(value)
+    return '{:>14}'.format(value)
+
+
+def main():
+    """Play the sweep, print a summary table, and save the results."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.sweep',
+                                     description=__doc__)
+    for name, value_type in PARAMETERS:
+        parser.add_argument(''.join(['--', name.replace('_', '-')]),
+                            dest=name, type=value_type, nargs='+',
+                            metavar='VALUE',
+                            help=''.join(['values of ', name,
+                                          ' to try (default: the '
+                                          "game's default)"]))
+    parser.add_argument('-g', '--games', type=int, default=10,
+                        help='games to play per combination (default: 10)')
+    parser.add_argument('-p', '--policy', choices=sorted(POLICIES),
+                        default='random',
+                        help='how the player plays (default: random)')
+    parser.add_argument('-m', '--max-time', type=float, default=120.0,
+                        help='seconds of game time before a game is '
+                             'stopped (default: 120)')
+    parser.add_argument('-w', '--workers', type=int,
+                        help='processes to play in (default: one per '
+                             'CPU core)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first game of each combination '
+                             '(default: 0)')
+    parser.add_argument('-o', '--output',
+                        help='save a row per game to this CSV file')
+    args = parser.parse_args()
+
+    values = {name: getattr(args, name) for name, value_type in PARAMETERS
+              if getattr(args, name) is not None}
+    combinations = get_combinations(values)
+
+    def print_progress(num_done, num_games):
+        print('\rPlayed', num_done, 'of', num_games, 'games', end='',
+              file=sys.stderr)
+
+    start_time = time.perf_counter()
+    rows = run_sweep(combinations, args.games, args.policy, args.max_time,
+                     args.workers, args.seed, print_progress)
+    print(' in {:.1f} s'.format(time.perf_counter() - start_time),
+          file=sys.stderr)
+
+    summaries = summarize(rows)
+    columns = list(summaries[0])
+    print(' '.join('{:>14}'.format(column[:14]) for column in columns))
+    for summary in summaries:
+        print(' '.join(_format_cell(summary[column]) for column in columns))
+
+    if args.output is not None:
+        save_rows(rows, args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -40,11 +40,60 @@ __credits__ = ['Joseph Borjon']
 __date__ = '2017-11-13'
 __status__ = 'Development'
 
-from gg.game import Game
-from gg.player import Player
-from gg.enemy import Enemy
-from gg.ammo import Ammo
-from gg.groundobject import GroundObject
-from gg.thumbnail import Thumbnail
-from gg.polardialogbox import PolarDialogBox
+import importlib
 from gg.colors import *
+
+# Every class lives in its own module, which is imported only when the
+# class is first used; that keeps 'import gg' fast, and pygame isn't
+# even loaded until it's needed
+_CLASS_MODULES = {
+    'Game': 'gg.game',
+    'Player': 'gg.player',
+    'Enemy': 'gg.enemy',
+    'Ammo': 'gg.ammo',
+    'AmmoPool': 'gg.ammopool',
+    'ProjectileEngine': 'gg.projectileengine',
+    'GroundObject': 'gg.groundobject',
+    'StaticLayer': 'gg.staticlayer',
+    'SpatialHash': 'gg.spatialhash',
+    'Thumbnail': 'gg.thumbnail',
+    'HudPanel': 'gg.hudpanel',
+    'PolarDialogBox': 'gg.polardialogbox',
+    'Replay': 'gg.replay',
+    'ScoreStore': 'gg.scorestore',
+    'ImageCache': 'gg.imagecache',
+    'AssetPreloader': 'gg.assetpreloader',
+    'TextCache': 'gg.textcache',
+    'TextureAtlas': 'gg.textureatlas',
+    'FrameProfiler': 'gg.frameprofiler',
+    'FramePacer': 'gg.framepacer',
+    'SimulationThread': 'gg.simulationthread',
+    'FrameSnapshot': 'gg.simulationthread',
+    'Environment': 'gg.environment',
+    'Scheduler': 'gg.scheduler',
+}
+# What 'from gg import *' brings in: every class, loaded right then, and
+# the colors
+__all__ = list(_CLASS_MODULES) + [name for name in globals()
+                                  if name.isupper()]
+_SUBMODULES = frozenset(module_name.split('.')[1] for module_name
+                        in _CLASS_MODULES.values()) | {'utils'}
+
+
+def __getattr__(name):
+    """Import a class or submodule of GG the first time it's used."""
+    if name in _CLASS_MODULES:
+        value = getattr(importlib.import_module(_CLASS_MODULES[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(''.join(['gg.', name]))
+    else:
+        raise AttributeError(''.join(["module 'gg' has no attribute '",
+                                      name, "'"]))
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the classes along with everything already loaded."""
+    return sorted(set(globals()) | set(_CLASS_MODULES))
@@ -13,28 +13,58 @@ import gg.utils
 
 
 class Ammo(pygame.sprite.DirtySprite):
-    """An object thrown at an opponent by someone in the game."""
+    """An object thrown at an opponent by someone in the game.
+
+    Ammo that belongs to a pool (see AmmoPool) isn't thrown away when
+    killed; it goes back to the pool to be fired again later.
+
+    The exact vertical position is kept as a float apart from the rect,
+    so that small steps at high frame rates aren't rounded away.
+    """
 
     def __init__(self, group, screen_rect, initial_center_pos, image_file,
-                 image_dir=None, is_direction_up=False, speed=800):
+                 image_dir=None, is_direction_up=False, speed=800, pool=None):
         """Set initial values for the ammo."""
-        pygame.sprite.DirtySprite.__init__(self, group)
+        if group is None:
+            pygame.sprite.DirtySprite.__init__(self)
+        else:
+            pygame.sprite.DirtySprite.__init__(self, group)
         self.image, self.rect = gg.utils._load_image(image_file, image_dir,
                                                      'ammo')
         self.dirty = 2
         self._is_direction_up = is_direction_up
         self._speed = speed
+        self._pool = pool
+        self._is_pooled = False
+        self._engine_slot = None
 
         if not is_direction_up:
             self._screen_bottom = screen_rect.bottom
 
         self.rect.center = initial_center_pos
+        self._y = float(self.rect.y)
 
     def update(self, delta_time):
         """Move the ammo up or down."""
         if self._is_direction_up and self.rect.bottom > 0:
-            self.rect.y -= self._speed * delta_time
+            self._y -= self._speed * delta_time
         elif not self._is_direction_up and self.rect.top < self._screen_bottom:
-            self.rect.y += self._speed * delta_time
+            self._y += self._speed * delta_time
         else:
             self.kill()
+            return
+
+        self.rect.y = self._y
+
+    def kill(self):
+        """Remove the ammo from its groups and return it to its pool."""
+        pygame.sprite.DirtySprite.kill(self)
+
+        if self._pool is not None:
+            self._pool._release(self)
+
+    def _reset(self, center_pos):
+        """Get a pooled ammo object ready to be fired again."""
+        self.rect.center = center_pos
+        self._y = float(self.rect.y)
+        self.dirty = 2
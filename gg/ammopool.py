@@ -0,0 +1,106 @@
+# ammopool.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import gg.ammo
+
+
+class AmmoPool:
+    """A reusable supply of ammo objects of a single type.
+
+    Creating a new sprite for every shot and adding it to a group is
+    slow, so the pool builds its ammo ahead of time. Firing takes an
+    ammo object out of the pool and puts it in the group; when the ammo
+    is killed (it left the screen or hit something), it's taken out of
+    the group and goes back into the pool to wait for the next shot.
+
+    If the pool runs dry, a new ammo object is built and the pool grows
+    by one, unless is_growable is false, in which case nothing is fired.
+    Either way, the shortage is counted as a miss.
+
+    If a ProjectileEngine is given, the ammo in play is handed to it to
+    be moved, so the ammo group shouldn't be updated on its own.
+    """
+
+    def __init__(self, group, screen_rect, image_file, image_dir=None,
+                 is_direction_up=False, speed=800, size=0, is_growable=True,
+                 engine=None):
+        """Build the initial supply of ammo."""
+        self.is_growable = is_growable
+        self.size = 0
+        self.num_active = 0
+        self.high_water_mark = 0
+        self.misses = 0
+        self._group = group
+        self._screen_rect = screen_rect
+        self._image_file = image_file
+        self._image_dir = image_dir
+        self._is_direction_up = is_direction_up
+        self._speed = speed
+        self._engine = engine
+        self._free_ammo = []
+
+        for i in range(size):
+            self._free_ammo.append(self._build_ammo())
+
+    def acquire(self, center_pos):
+        """Fire an ammo object from the position given and return it.
+
+        Return None if the pool is empty and not allowed to grow.
+        """
+        if len(self._free_ammo) > 0:
+            ammo = self._free_ammo.pop()
+        else:
+            self.misses += 1
+            if not self.is_growable:
+                return None
+            ammo = self._build_ammo()
+
+        ammo._is_pooled = False
+        ammo._reset(center_pos)
+        self._group.add(ammo)
+
+        if self._engine is not None:
+            self._engine.add(ammo, self._screen_rect)
+
+        self.num_active += 1
+        if self.num_active > self.high_water_mark:
+            self.high_water_mark = self.num_active
+
+        return ammo
+
+    def get_stats(self):
+        """Return a dictionary with the pool size and usage counters."""
+        return {
+            'size': self.size,
+            'active': self.num_active,
+            'high_water_mark': self.high_water_mark,
+            'misses': self.misses,
+        }
+
+    def _build_ammo(self):
+        """Create a new ammo object that belongs to the pool."""
+        ammo = gg.ammo.Ammo(None, self._screen_rect, (0, 0),
+                            self._image_file, self._image_dir,
+                            self._is_direction_up, self._speed, self)
+        ammo._is_pooled = True
+        self.size += 1
+        return ammo
+
+    def _release(self, ammo):
+        """Take back an ammo object that was killed."""
+        if ammo._is_pooled:
+            return
+
+        ammo._is_pooled = True
+        self._free_ammo.append(ammo)
+        self.num_active -= 1
+
+        if self._engine is not None:
+            self._engine.remove(ammo)
@@ -0,0 +1,111 @@
+# assetpreloader.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import concurrent.futures
+import os
+import pygame
+import gg.imagecache
+import gg.utils
+
+
+class AssetPreloader:
+    """Loads images on background threads ahead of when they're needed.
+
+    Reading and decoding image files is the slow part of loading them,
+    and pygame lets other threads run while it does that, so several
+    images can be decoded at once while the game does something else,
+    like showing the splash screen. Converting an image to the display
+    format has to happen on the main thread, though, so that's left for
+    convert_ready() and finish(), which put the converted images in the
+    shared image cache. From then on, loading those images is instant.
+
+    Images that can't be loaded are simply skipped; the error is
+    reported as usual when the game tries to load them itself. So are
+    images too big for the image cache, which get loaded again later.
+    """
+
+    def __init__(self, max_workers=4):
+        """Create a preloader with nothing to load yet."""
+        self.max_workers = max_workers
+        self._files = []
+        self._futures = {}
+        self._executor = None
+        self._num_converted = 0
+
+    def add(self, file_name, directory=None):
+        """Ask for an image to be loaded, unless it already is."""
+        key = (directory, file_name, gg.imagecache.ImageCache.CONVERT_AUTO)
+        if (file_name is None or key in gg.utils._image_cache or
+            (directory, file_name) in self._files):
+            return
+
+        self._files.append((directory, file_name))
+
+    def start(self):
+        """Start decoding every image asked for on the thread pool."""
+        if not self._files or self._executor is not None:
+            return
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(self._files)))
+
+        for directory, file_name in self._files:
+            if directory is None:
+                path = file_name
+            else:
+                path = os.path.join(directory, file_name)
+            future = self._executor.submit(pygame.image.load, path)
+            self._futures[future] = (directory, file_name)
+
+    def get_progress(self):
+        """Return the fraction of the images done decoding, from 0 to 1."""
+        if not self._files:
+            return 1.0
+
+        num_done = self._num_converted + sum(1 for future in self._futures
+                                             if future.done())
+        return num_done / len(self._files)
+
+    def is_done(self):
+        """Return true if every image has been decoded."""
+        return all(future.done() for future in self._futures)
+
+    def convert_ready(self):
+        """Convert the images decoded so far and put them in the cache.
+
+        Call this from the main thread only. Return the number of images
+        converted.
+        """
+        done_futures = [future for future in self._futures if future.done()]
+        for future in done_futures:
+            directory, file_name = self._futures.pop(future)
+            self._num_converted += 1
+
+            if future.exception() is not None:
+                continue
+
+            conversion = gg.imagecache.ImageCache.CONVERT_AUTO
+            image = gg.utils._convert_image(future.result(), conversion)
+            gg.utils._image_cache.put((directory, file_name, conversion),
+                                      image)
+
+        return len(done_futures)
+
+    def finish(self):
+        """Wait for every image to be decoded and convert the rest.
+
+        Call this from the main thread only.
+        """
+        concurrent.futures.wait(list(self._futures))
+        self.convert_ready()
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
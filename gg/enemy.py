@@ -10,6 +10,7 @@
 
 import random
 import pygame
+import gg.ammo
 import gg.utils
 
 
@@ -23,24 +24,45 @@ class Enemy(pygame.sprite.DirtySprite):
 
     The minimum speed value is 100. If a smaller value is passed, it is
     automatically converted to 100.
+
+    The exact horizontal position is kept as a float apart from the rect,
+    which can only hold whole pixels, so that small steps add up instead
+    of being rounded away.
+
+    All the enemy's random choices come from rng, a random.Random object,
+    if one is given, so that a game can be played back exactly. Otherwise
+    the random module is used.
+
+    If a Scheduler is given, the enemy leaves its group while knocked
+    out and schedules its wake-up, and when awake, it schedules its bomb
+    drop for the time it'll reach the bombing point. Then update() only
+    has to move awake enemies, and sleeping ones cost nothing at all.
+    Otherwise, the enemy counts down and checks for the bombing point
+    itself on every update.
     """
     LEFT = 0
     RIGHT = 1
+    _BOMB_TIMER_MARGIN = 1e-6    # seconds; far more than rounding errors
 
     def __init__(self, group, bomb_data, screen_rect, boundaries, image_file,
-                 image_dir=None, speed=600):
+                 image_dir=None, speed=600, rng=None, scheduler=None):
         """Set initial values for the enemy."""
         pygame.sprite.DirtySprite.__init__(self, group)
-        self.image, self.rect = gg.utils._load_image(image_file, image_dir,
-                                                     'the enemy')
+        self._group = group
+        self._scheduler = scheduler
+        self._bomb_timer = None
+        self._images, self.rect = gg.utils._load_image_orientations(
+            image_file, image_dir, 'the enemy')
+        self.image = self._images[self.RIGHT]
         self.dirty = 2
+        self._random = random if rng is None else rng
         self._bomb_data = bomb_data
         self._screen_rect = screen_rect
         self._top_boundary, self._bottom_boundary = boundaries
-        self._is_awake = bool(random.randint(0, 1))    # does it start awake?
+        self._is_awake = bool(self._random.randint(0, 1))  # start awake?
         self._direction = self.RIGHT
-        self._previous_dir = self.RIGHT
         self._wake_up_timer = 0.0
+        self._x = float(self.rect.x)
         self._target_point = None
         self._is_bomb_dropped = False
 
@@ -63,20 +85,24 @@ class Enemy(pygame.sprite.DirtySprite):
         """
         if self._is_awake:
             if self._direction == self.LEFT:
-                self.rect.x -= self._speed * delta_time
+                self._x -= self._speed * delta_time
             elif self._direction == self.RIGHT:
-                self.rect.x += self._speed * delta_time
+                self._x += self._speed * delta_time
             else:
                 raise RuntimeError(''.join(["Invalid enemy direction '",
                                             str(self._direction), "'."]))
 
+            self.rect.x = self._x
+
             # Disappear if we've gone off a screen edge
             if self.rect.right < 0 or self.rect.left > self._screen_rect.right:
                 self.knock_out()
                 return
 
-            # Drop the bomb if we're at the target point
-            if (self.rect.collidepoint(self._target_point) and
+            # Drop the bomb if we're at the target point, unless that's
+            # been scheduled
+            if (self._scheduler is None and
+                self.rect.collidepoint(self._target_point) and
                 not self._is_bomb_dropped):
                 self._drop_bomb()
         elif self._wake_up_timer > 0:
@@ -87,15 +113,21 @@ class Enemy(pygame.sprite.DirtySprite):
     def knock_out(self):
         """Put the enemy to sleep and start a timer to keep him out."""
         self._is_awake = False
-        self._previous_dir = self._direction
         self.rect.right = -1    # to keep the enemy out of the screen
-        self._wake_up_timer = random.randint(1, 5)    # stay out for 1-5 secs
+        self._x = float(self.rect.x)
+        self._wake_up_timer = self._random.randint(1, 5)  # out for 1-5 secs
+
+        if self._scheduler is not None:
+            self._scheduler.cancel(self._bomb_timer)
+            self._bomb_timer = None
+            self.remove(self._group)
+            self._scheduler.schedule(self._wake_up_timer, self._wake_up)
 
     def _wake_up(self):
         """Bring the enemy back on the proper side of the screen."""
         self._is_awake = True
         self._is_bomb_dropped = False
-        self._direction = random.randint(0, 1)
+        self._direction = self._random.randint(0, 1)
 
         # Put the enemy back on the appropriate side of the screen
         if self._direction == self.RIGHT:
@@ -106,30 +138,79 @@ class Enemy(pygame.sprite.DirtySprite):
             raise RuntimeError(''.join(["Invalid enemy direction '",
                                         str(self._direction), "'."]))
 
-        if self._direction != self._previous_dir:
-            self.image = pygame.transform.flip(self.image, True, False)
+        self._x = float(self.rect.x)
+
+        # Face the right way; the mirror image is already there
+        self.image = self._images[self._direction]
 
         # Pick a random y-position within the valid corridor
         try:
-            self.rect.y = random.randint(self._top_boundary,
-                                         self._bottom_boundary
-                                         - self.rect.height)
+            self.rect.y = self._random.randint(self._top_boundary,
+                                               self._bottom_boundary
+                                               - self.rect.height)
         except ValueError:
             self.rect.y = 0
 
         # Pick a point to drop the bomb
-        self._target_point = (random.randint(16, self._screen_rect.width - 16),
-                              self.rect.centery)
+        self._target_point = (
+            self._random.randint(16, self._screen_rect.width - 16),
+            self.rect.centery)
+
+        if self._scheduler is not None:
+            self.add(self._group)
+            self._schedule_bomb()
+
+    def _schedule_bomb(self):
+        """Set the bomb timer to go off just before the bombing point.
+
+        The time is worked out from the exact position, but the game
+        clock and the position each add up their own rounding errors, so
+        the timer goes off a hair early, and the bomb is only dropped once
+        the rect really covers the point, on the same tick as if the
+        enemy were checking on every update.
+        """
+        delay = self._get_distance_to_target() / self._speed
+        self._bomb_timer = self._scheduler.schedule(
+            max(delay - self._BOMB_TIMER_MARGIN, self._BOMB_TIMER_MARGIN),
+            self._check_bomb_timer)
+
+    def _check_bomb_timer(self):
+        """Drop the bomb if over the bombing point, or wait some more."""
+        self._bomb_timer = None
+        if self.rect.collidepoint(self._target_point):
+            self._drop_bomb()
+        elif ((self._direction == self.RIGHT and
+               self.rect.left <= self._target_point[0]) or
+              (self._direction == self.LEFT and
+               self.rect.right > self._target_point[0])):
+            # Not there yet; a fast enemy may fly right past, though
+            self._schedule_bomb()
+
+    def _get_distance_to_target(self):
+        """Return how far the enemy is from flying over the bombing point.
+
+        That's when the rect, whose position is rounded from the exact
+        one, first covers the point.
+        """
+        if self._direction == self.RIGHT:
+            return self._target_point[0] - self.rect.width + 0.5 - self._x
+        return self._x - self._target_point[0] - 0.5
 
     def _drop_bomb(self):
         """Drop a bomb when the bombing point is reached."""
-        new_bomb = gg.ammo.Ammo(
-                self._bomb_data['group'],
-                self._bomb_data['screen_rect'],
-                self.rect.center,
-                self._bomb_data['image_file'],
-                self._bomb_data['image_dir'],
-                not self._bomb_data['is_direction_up'],
-                self._bomb_data['speed']
-            )
+        bomb_pool = self._bomb_data.get('pool')
+
+        if bomb_pool is None:
+            new_bomb = gg.ammo.Ammo(
+                    self._bomb_data['group'],
+                    self._bomb_data['screen_rect'],
+                    self.rect.center,
+                    self._bomb_data['image_file'],
+                    self._bomb_data['image_dir'],
+                    not self._bomb_data['is_direction_up'],
+                    self._bomb_data['speed']
+                )
+        else:
+            bomb_pool.acquire(self.rect.center)
+
         self._is_bomb_dropped = True
@@ -0,0 +1,167 @@
+# environment.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Environment:
+    """Lets code play a game one tick at a time, as fast as it can.
+
+    This is for bots: automated testing, tuning the difficulty, and the
+    like. Set up a Game as usual, but instead of calling its run()
+    method, wrap it in an Environment, call reset() to start a game, and
+    then step() with an action for every tick until it says the game is
+    done:
+
+        env = gg.Environment(game)
+        observation = env.reset(seed=1)
+        is_done = False
+        while not is_done:
+            action = gg.Environment.SHOOT | gg.Environment.LEFT
+            observation, reward, is_done = env.step(action)
+        env.close()
+
+    An action is IDLE or any combination of LEFT, RIGHT, SHOOT, and
+    RELOAD, joined with |. Moving both left and right means standing
+    still, and so does moving into the edge of the screen.
+
+    The observation is a NumPy array with a row per object in play: the
+    player first (unless knocked out), then the enemies, the bombs, and
+    the missiles. Each row holds the kind of object (PLAYER, ENEMY,
+    BOMB, or MISSILE) and the x and y of its center, in pixels. The
+    reward is how much the score changed during the tick.
+
+    Nothing is drawn unless is_rendered is true, in which case every
+    tick is drawn on the game's screen, a window unless the game is
+    headless. Without rendering, the game always runs headless.
+
+    NumPy is needed; check Environment.is_available() first.
+    """
+    IDLE = 0
+    LEFT = 1
+    RIGHT = 2
+    SHOOT = 4
+    RELOAD = 8
+
+    PLAYER = 0
+    ENEMY = 1
+    BOMB = 2
+    MISSILE = 3
+
+    def __init__(self, game, is_rendered=False):
+        """Get ready to play the game given."""
+        self.game = game
+        self.is_rendered = is_rendered
+        self._is_started = False
+
+    @staticmethod
+    def is_available():
+        """Return true if NumPy can be imported."""
+        return numpy is not None
+
+    def reset(self, seed=None):
+        """Start a new game and return the first observation.
+
+        The same seed always gives the same game, as long as the same
+        actions are taken. Without a seed, the game's own seed is used
+        (see Game).
+        """
+        if numpy is None:
+            raise RuntimeError('The Environment needs NumPy')
+
+        game = self.game
+        if not self._is_started:
+            # Nobody's there to dismiss the splash screen, and nobody
+            # needs a window unless the game is rendered; the game's own
+            # settings are left as they were
+            is_headless = game.is_headless
+            splash_image = game.splash_image
+            game.is_headless = is_headless or not self.is_rendered
+            game.splash_image = None
+            try:
+                game._init_environment()
+            finally:
+                game.is_headless = is_headless
+                game.splash_image = splash_image
+            self._is_started = True
+
+        # The seed given is for this game only
+        game_seed = game.seed
+        if seed is not None:
+            game.seed = seed
+
+        game._is_main_loop_running = True
+        try:
+            game._init_new_game()
+        finally:
+            game.seed = game_seed
+        if self.is_rendered:
+            game._render_frame()
+
+        return self.get_observation()
+
+    def step(self, action):
+        """Play one tick with the action given.
+
+        Return a tuple of the new observation, the reward, and whether
+        the game is over. Once the game is over, call reset() before
+        stepping again.
+        """
+        game = self.game
+        game._set_player_direction(bool(action & self.LEFT),
+                                   bool(action & self.RIGHT))
+
+        game._is_reload_pending = bool(action & self.RELOAD)
+        game._num_pending_shots = 1 if action & self.SHOOT else 0
+
+        score = game._score
+        game._run_tick(self._get_tick_time())
+        if self.is_rendered:
+            pygame.event.pump()    # keep the window responsive
+            game._render_frame()
+
+        is_done = (not game._is_main_loop_running or
+                   not game._player.is_alive or game._buildings_left <= 0)
+        return (self.get_observation(), game._score - score, is_done)
+
+    def get_observation(self):
+        """Return the observation of the game as it is now."""
+        game = self.game
+        rows = []
+
+        if game._player.is_alive:
+            rows.append((self.PLAYER,) + game._player.rect.center)
+
+        for kind, group in ((self.ENEMY, game._enemy_group),
+                            (self.BOMB, game._bomb_group),
+                            (self.MISSILE, game._missile_group)):
+            rows.extend([(kind,) + sprite.rect.center for sprite in group])
+
+        if not rows:
+            return numpy.empty((0, 3), dtype=numpy.int32)
+        return numpy.array(rows, dtype=numpy.int32)
+
+    def close(self):
+        """End the game and let pygame go."""
+        if self._is_started:
+            self.game._score_store.close()
+            self.game._quit_pygame()
+            self._is_started = False
+
+    def _get_tick_time(self):
+        """Return how long a tick lasts, in seconds."""
+        if self.game._simulation_rate is None:
+            return 1.0 / self.game.TARGET_FPS
+        return 1.0 / self.game._simulation_rate
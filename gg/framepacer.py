@@ -0,0 +1,164 @@
+# framepacer.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import collections
+import time
+
+
+class FramePacer:
+    """Keeps frames coming at a steady rate and measures how long they are.
+
+    At the end of every frame, wait() holds the game until the frame's
+    deadline, which is 1 / target_fps seconds after the last one, and
+    returns how long the frame lasted. How it waits depends on the mode:
+
+    -SLEEP: sleep until the deadline. Cheapest, but the OS may wake the
+     game up a millisecond or more late.
+    -BUSY: spin on the clock until the deadline. As precise as it gets,
+     but it keeps a CPU core busy.
+    -HYBRID: sleep until spin_time seconds before the deadline, then
+     spin the rest of the way. Nearly as precise as BUSY, nearly as
+     cheap as SLEEP.
+    -VSYNC: don't wait at all; the display is expected to hold the game
+     when it flips, so the game must flip every frame. Some displays
+     take vsync without honoring it, like software renderers, so if the
+     frames keep coming faster than any screen refreshes, the pacer
+     switches to SLEEP for good.
+    -UNCAPPED: don't wait at all, and go as fast as possible.
+
+    A frame that ends after its deadline counts as a missed deadline,
+    and the next deadline is set from then on instead of trying to catch
+    up. With VSYNC, a frame that lasts more than one and a half frames
+    counts as missed.
+
+    The duration returned is clamped to max_delta_time, so a long hiccup
+    doesn't make everything jump, and smoothed if smoothing is greater
+    than zero: smoothing is the fraction of the previous duration kept,
+    between 0 and 1.
+    """
+    SLEEP = 'sleep'
+    BUSY = 'busy'
+    HYBRID = 'hybrid'
+    VSYNC = 'vsync'
+    UNCAPPED = 'uncapped'
+
+    # A frame shorter than this can't have waited for a screen refresh,
+    # and this many of them in a row means vsync isn't working
+    _MIN_REFRESH_TIME = 1.0 / 250
+    _MAX_UNPACED_FRAMES = 10
+
+    def __init__(self, target_fps=60, mode=SLEEP, smoothing=0.0,
+                 max_delta_time=0.25, spin_time=0.002):
+        """Get ready to pace frames."""
+        self.target_fps = target_fps
+        self.mode = mode
+        self.smoothing = smoothing
+        self.max_delta_time = max_delta_time
+        self.spin_time = spin_time
+        self.missed_deadlines = 0
+        self._clock = time.perf_counter
+        self._frame_times = collections.deque(maxlen=60)
+        self._last_frame_start = None
+        self._deadline = None
+        self._delta_time = None
+        self._num_unpaced_frames = 0
+        self.start()
+
+    def start(self):
+        """Start counting from now, forgetting any earlier frames."""
+        self.missed_deadlines = 0
+        self._frame_times.clear()
+        self._last_frame_start = self._clock()
+        self._deadline = self._last_frame_start + self._get_frame_time()
+        self._delta_time = None
+        self._num_unpaced_frames = 0
+
+    def resync(self):
+        """Start the next frame now, as if the last one had just ended.
+
+        Call it after the game has been stopped on purpose for a while,
+        like when it was paused, so the pause doesn't count as a frame.
+        """
+        self._last_frame_start = self._clock()
+        self._deadline = self._last_frame_start + self._get_frame_time()
+
+    def wait(self):
+        """Wait for the end of the frame and return how long it lasted.
+
+        The duration is in seconds, clamped and smoothed.
+        """
+        frame_time = self._get_frame_time()
+        now = self._clock()
+
+        if self.mode == self.VSYNC:
+            if now - self._last_frame_start > frame_time * 1.5:
+                self.missed_deadlines += 1
+            self._check_vsync(now)
+        elif self.mode != self.UNCAPPED:
+            if now > self._deadline:
+                self.missed_deadlines += 1
+                self._deadline = now
+            else:
+                self._wait_until(self._deadline)
+                now = self._clock()
+
+        self._deadline += frame_time
+        delta_time = now - self._last_frame_start
+        self._last_frame_start = now
+        self._frame_times.append(delta_time)
+
+        delta_time = min(delta_time, self.max_delta_time)
+        if self._delta_time is not None and self.smoothing > 0:
+            delta_time = (self.smoothing * self._delta_time
+                          + (1 - self.smoothing) * delta_time)
+        self._delta_time = delta_time
+
+        return delta_time
+
+    def get_fps(self):
+        """Return the average frame rate of the last frames."""
+        total_time = sum(self._frame_times)
+        if total_time <= 0:
+            return 0.0
+        return len(self._frame_times) / total_time
+
+    def _check_vsync(self, now):
+        """Switch to SLEEP if the flips have stopped waiting for vsync."""
+        if now - self._last_frame_start >= self._MIN_REFRESH_TIME:
+            self._num_unpaced_frames = 0
+            return
+
+        self._num_unpaced_frames += 1
+        if self._num_unpaced_frames >= self._MAX_UNPACED_FRAMES:
+            self.mode = self.SLEEP
+            self._deadline = now    # the next one is a frame from now
+
+    def _get_frame_time(self):
+        """Return how long a frame should last, in seconds."""
+        if not self.target_fps:
+            return 0.0
+        return 1.0 / self.target_fps
+
+    def _wait_until(self, deadline):
+        """Hold the game until the deadline, as dictated by the mode."""
+        if self.mode == self.SLEEP:
+            remaining_time = deadline - self._clock()
+            if remaining_time > 0:
+                time.sleep(remaining_time)
+            return
+
+        if self.mode == self.HYBRID:
+            sleep_time = deadline - self._clock() - self.spin_time
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+
+        clock = self._clock
+        while clock() < deadline:
+            pass
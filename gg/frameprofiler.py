@@ -0,0 +1,181 @@
+# frameprofiler.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import collections
+import json
+import os
+import time
+
+
+class FrameProfiler:
+    """Measures how long each phase of every frame takes.
+
+    The main loop calls enter() with the name of a phase (say, 'draw')
+    whenever it starts doing something different; the time since the
+    previous call is added to the previous phase. end_frame() closes the
+    frame and starts the next one. That's a single clock reading per
+    phase change, so the profiler hardly slows the game down.
+
+    The last window_size frames are kept to work out rolling averages
+    and worst cases for each phase. If is_tracing is true, every phase
+    of every frame is also kept so it can be saved as a trace file with
+    save_trace().
+    """
+    OTHER = 'other'
+
+    def __init__(self, window_size=120, is_tracing=False):
+        """Start profiling."""
+        self.is_tracing = is_tracing
+        self.phases = []
+        self._frames = collections.deque(maxlen=window_size)
+        self._trace = []
+        self._clock = time.perf_counter
+        self._frame_num = 0
+        self._frame_times = {}
+        self._phase = self.OTHER
+        self._phase_start = self._clock()
+
+    def reset(self):
+        """Forget every frame measured and start a new one now."""
+        self.phases = []
+        self._frames.clear()
+        self._trace = []
+        self._frame_num = 0
+        self._frame_times = {}
+        self._phase = self.OTHER
+        self._phase_start = self._clock()
+
+    def enter(self, phase):
+        """Finish the current phase and start another one."""
+        now = self._clock()
+        self._add_time(now)
+        self._phase = phase
+        self._phase_start = now
+
+    def end_frame(self):
+        """Finish the current frame and start the next one."""
+        now = self._clock()
+        self._add_time(now)
+        self._frames.append(self._frame_times)
+        self._frame_times = {}
+        self._frame_num += 1
+        self._phase = self.OTHER
+        self._phase_start = now
+
+    def get_stats(self):
+        """Return the rolling average and worst time of every phase.
+
+        The return value is a list of (phase, average, worst) tuples in
+        seconds, in the order in which phases were first seen.
+        """
+        num_frames = len(self._frames)
+        stats = []
+
+        for phase in self.phases:
+            total_time = 0.0
+            worst_time = 0.0
+            for frame_times in self._frames:
+                phase_time = frame_times.get(phase, 0.0)
+                total_time += phase_time
+                if phase_time > worst_time:
+                    worst_time = phase_time
+
+            if num_frames > 0:
+                stats.append((phase, total_time / num_frames, worst_time))
+
+        return stats
+
+    def save_trace(self, path):
+        """Write the phases traced so far to a file.
+
+        A file name ending in .jsonl gets one JSON object per frame with
+        the time of each phase in milliseconds. Anything else gets the
+        Chrome trace event format, which chrome://tracing and Perfetto
+        can open.
+        """
+        if os.path.splitext(path)[1] == '.jsonl':
+            self._save_json_lines(path)
+        else:
+            self._save_chrome_trace(path)
+
+    def _add_time(self, now):
+        """Add the time since the phase started to the phase."""
+        phase = self._phase
+        duration = now - self._phase_start
+
+        try:
+            self._frame_times[phase] += duration
+        except KeyError:
+            self._frame_times[phase] = duration
+            if phase not in self.phases:
+                self.phases.append(phase)
+
+        if self.is_tracing:
+            self._trace.append((self._frame_num, phase, self._phase_start,
+                                duration))
+
+    def _save_chrome_trace(self, path):
+        """Write the trace in the Chrome trace event format."""
+        events = []
+        for frame_num, phase, start_time, duration in self._trace:
+            events.append({
+                'name': phase,
+                'cat': 'frame',
+                'ph': 'X',
+                'ts': start_time * 1000000,
+                'dur': duration * 1000000,
+                'pid': 0,
+                'tid': 0,
+                'args': {'frame': frame_num},
+            })
+
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+    def _save_json_lines(self, path):
+        """Write the trace as one line of JSON per frame."""
+        with open(path, 'w') as file:
+            frame = None
+            for frame_num, phase, start_time, duration in self._trace:
+                if frame is None or frame['frame'] != frame_num:
+                    if frame is not None:
+                        file.write(json.dumps(frame) + '\n')
+                    frame = {'frame': frame_num, 'start_ms': start_time * 1000,
+                             'phases_ms': {}}
+
+                phases_ms = frame['phases_ms']
+                phases_ms[phase] = phases_ms.get(phase, 0.0) + duration * 1000
+
+            if frame is not None:
+                file.write(json.dumps(frame) + '\n')
+
+
+class NullProfiler:
+    """A stand-in for FrameProfiler that measures nothing at all.
+
+    The main loop always talks to a profiler; when profiling is off, it
+    gets one of these, whose methods do nothing.
+    """
+
+    def reset(self):
+        """Do nothing."""
+        pass
+
+    def enter(self, phase):
+        """Do nothing."""
+        pass
+
+    def end_frame(self):
+        """Do nothing."""
+        pass
+
+    def get_stats(self):
+        """Return no stats."""
+        return []
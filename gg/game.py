@@ -10,8 +10,26 @@
 
 import os
 import sys
-import struct
+import random
+import time
+import gg.ammopool
+import gg.assetpreloader
 import gg.colors
+import gg.enemy
+import gg.framepacer
+import gg.frameprofiler
+import gg.groundobject
+import gg.hudpanel
+import gg.imagecache
+import gg.player
+import gg.polardialogbox
+import gg.projectileengine
+import gg.replay
+import gg.scheduler
+import gg.scorestore
+import gg.simulationthread
+import gg.spatialhash
+import gg.staticlayer
 import gg.utils
 
 try:
@@ -77,12 +95,30 @@ class Game:
     -keys_shoot: list of keys that fire the missile.
     -keys_reload_ammo: list of keys that reload the ammo when out.
     -keys_pause: list of keys that pause the game.
+    -is_dirty_rect_mode: redraw only the parts of the screen that change?
+    -dirty_area_threshold: screen fraction beyond which all is redrawn.
+    -is_vectorized_ammo: move all the ammo at once with NumPy?
+    -simulation_rate: fixed updates per second; None means once a frame.
+    -seed: number from 0 to 2 ** 32 - 1 that all randomness comes from.
+    -replay_record_file: file to record the game in for later playback.
+    -replay_play_file: replay file to play back instead of the keyboard.
+    -is_headless: run as fast as possible with no window or prompts?
+    -headless_delta_time: seconds per headless frame; None is one tick.
+    -headless_max_time: simulated seconds before a headless game stops.
+    -is_profiling: show the time of each part of a frame with the FPS?
+    -profile_trace_file: file to save every frame's profile in, if any.
+    -frame_pacing: how to wait for the next frame (see FramePacer).
+    -pygame_modules: more pygame modules to start, like 'mixer'.
+    -delta_time_smoothing: how much frame times are smoothed, 0 to 1.
+    -is_render_threaded: simulate on another thread while drawing?
 
     Client-invoked method:
 
     -run(): once all the modifiable attributes are set as desired, call
             this method to start the game.
     """
+    _DEFAULT_AMMO_POOL_SIZE = 10
+    _MAX_UNSIMULATED_TIME = 0.25    # seconds; avoids a death spiral
 
     def __init__(self):
         """Set default values for all the game attributes."""
@@ -134,12 +170,35 @@ class Game:
         self.keys_shoot = [pygame.K_SPACE]
         self.keys_reload_ammo = [pygame.K_LCTRL, pygame.K_RCTRL]
         self.keys_pause = [pygame.K_p, pygame.K_PAUSE]
+        self.is_dirty_rect_mode = False
+        self.dirty_area_threshold = 0.5
+        self.is_vectorized_ammo = False
+        self.simulation_rate = 120
+        self.seed = None
+        self.replay_record_file = None
+        self.replay_play_file = None
+        self.is_headless = False
+        self.headless_delta_time = None
+        self.headless_max_time = None
+        self.is_profiling = False
+        self.profile_trace_file = None
+        self.frame_pacing = gg.framepacer.FramePacer.SLEEP
+        self.delta_time_smoothing = 0.0
+        self.pygame_modules = []
+        self.is_render_threaded = False
 
         # Attributes you shouldn't change from your own code
         self._screen = None
         self._screen_rect = None
         self._screen_height = None
         self._background_surf = None
+        self._static_layer = None
+        self._last_dirty_rects = []
+        self._blit_sequence = []
+        self._needs_full_redraw = True
+        self._razed_buildings = []
+        self._simulated_time = 0.0
+        self._unsimulated_time = 0.0
         self._screen_font = None
         self._is_still_playing = True
         self._is_main_loop_running = True
@@ -148,12 +207,15 @@ class Game:
         self._is_screen_info_shown = False
         self._keyboard_state = None
         self._player = None
-        self._player_thumbnails = []
+        self._lives_panel = None
         self._data_dir = 'gamedata'
-        self._data_file = os.path.join(self._data_dir, 'game.dat')
+        self._score_store = None
+        self._session_stats = None
+        self._session_start_time = None
         self._score = None
         self._score_text = None
         self._score_rect = None
+        self._shown_score = None
         self._high_score = 0
         self._high_score_text = None
         self._high_score_rect = None
@@ -162,10 +224,27 @@ class Game:
         self._missile_group = None
         self._bomb_group = None
         self._building_group = None
-        self._thumbnail_group = None
-        self._missile_thumbnails = []
+        self._shots_panel = None
+        self._collision_grid = gg.spatialhash.SpatialHash()
+        self._missile_pool = None
+        self._bomb_pool = None
+        self._projectile_engine = None
+        self._scheduler = None
+        self._rng = None
+        self._replay_recording = None
+        self._replay_playback = None
+        self._simulation_rate = self.simulation_rate
+        self._tick_index = 0
+        self._profiler = gg.frameprofiler.NullProfiler()
+        self._simulation_profiler = self._profiler
+        self._num_pending_shots = 0
+        self._is_reload_pending = False
         self._buildings_left = self.building_count
-        self._clock = None
+        self._frame_pacer = None
+        self._asset_preloader = None
+        self._sprite_atlas = None
+        self._is_vsync_on = False
+        self._has_set_video_driver = False
         self.TARGET_FPS = 60
 
     def run(self):
@@ -174,13 +253,9 @@ class Game:
         Initialize all the pertinent game objects and then run the main
         game loop.
         """
-        # Initialize the game environment
+        # Initialize the game environment and show the splash screen
         self._init_environment()
 
-        # Display the splash screen if one is given
-        if self.splash_image is not None:
-            self._display_splash_screen(self._screen)
-
         # Begin playing the game
         while self._is_still_playing:
             self._init_new_game()
@@ -188,12 +263,21 @@ class Game:
             # The main loop
             self._run_main_loop()
 
-            # Post-loop work: update the high score, etc.
-            if self._score > self._high_score:
-                self._update_high_score()
-                has_high_score = True
-            else:
-                has_high_score = False
+            if self._replay_recording is not None:
+                self._save_replay()
+
+            if self.profile_trace_file is not None:
+                self._save_profile_trace()
+
+            # Nobody can be asked to play again without a display, and
+            # a replay is only good for one game
+            if self.is_headless or self._replay_playback is not None:
+                self._is_still_playing = False
+                continue
+
+            # Post-loop work: save the score, update the high score, etc.
+            has_high_score = self._score > self._high_score
+            self._record_session()
 
             if self._player.is_alive and self._buildings_left > 0:
                 end_message = None
@@ -210,100 +294,408 @@ class Game:
         # Here the player has exited both loops
         # Quit pygame once we're done with itnmiuy    zzzcucv
         # (I meant to say just "with it," but my 3-year-old disagreed)
-        pygame.quit()
+        self._score_store.close()
+        self._quit_pygame()
 
     def _run_main_loop(self):
         """Run the main loop of the game.
 
         This is it - where the magic of the game happens.
         """
-        MAX_FPS = self.TARGET_FPS
         delta_time = 0
-        self._clock = pygame.time.Clock()
+        self._unsimulated_time = 0.0
+        self._frame_pacer = gg.framepacer.FramePacer(
+            self.TARGET_FPS, self._get_frame_pacing_mode(),
+            self.delta_time_smoothing, self._MAX_UNSIMULATED_TIME)
+        profiler = self._profiler
+        profiler.reset()
+
+        # Nobody's watching a headless game, so there's nothing to draw
+        # alongside the simulation
+        if self.is_render_threaded and not self.is_headless:
+            simulation = gg.simulationthread.SimulationThread(
+                self._simulate_to_snapshot, self._take_snapshot(0))
+            simulation.start()
+
+            # The profiler can only keep track of one thread
+            self._simulation_profiler = gg.frameprofiler.NullProfiler()
+        else:
+            simulation = None
+            self._simulation_profiler = profiler
 
         # Start the loop
         while (self._is_main_loop_running and
                self._player.is_alive and self._buildings_left > 0):
-            has_score_changed = False
-
-            if not self._is_paused:
-                # Check if the player is hit by a bomb
-                if pygame.sprite.spritecollide(self._player,
-                                               self._bomb_group, True):
-                    self._player.knock_out()
-                    self._thumbnail_group.remove(self._player_thumbnails.pop())
-
-                # Check for bomb hits on the buildings
-                for building in pygame.sprite.groupcollide(
-                    self._building_group, self._bomb_group, False, True):
-                    if not building.is_razed:
-                        building.is_razed = True
-                        self._buildings_left -= 1
-                        self._score -= self.score_loss_factor
-
-                    if not has_score_changed:
-                        has_score_changed = True
-
-                # Check for missile hits on the enemies
-                for enemy in pygame.sprite.groupcollide(self._enemy_group,
-                                                        self._missile_group,
-                                                        False, True):
-                    enemy.knock_out()
-                    self._score += self.score_factor
-                    if not has_score_changed:
-                        has_score_changed = True
-
-                # Check for missile hits on the bombs
-                for bomb in pygame.sprite.groupcollide(self._bomb_group,
-                                                       self._missile_group,
-                                                       True, True):
-                    self._score += self.score_factor
-                    if not has_score_changed:
-                        has_score_changed = True
-
-                # Update the frame
-                self._screen.blit(self._background_surf, (0, 0))
-
-                self._bomb_group.update(delta_time)
-                bomb_rects = self._bomb_group.draw(self._screen)
-
-                self._missile_group.update(delta_time)
-                missile_rects = self._missile_group.draw(self._screen)
-
-                self._enemy_group.update(delta_time)
-                enemy_rects = self._enemy_group.draw(self._screen)
-
-                self._building_group.update()
-                building_rects = self._building_group.draw(self._screen)
-
-                if self._player.is_alive:
-                    self._screen.blit(self._player.image, self._player.rect)
-
-                self._blit_current_score(has_score_changed)
-                self._screen.blit(self._high_score_text, self.high_score_pos)
-
-                thumbnail_rects = self._thumbnail_group.draw(self._screen)
-
-                if self._is_screen_info_shown:
-                    info_rects = self._blit_screen_info(self._clock.get_fps())
-                else:
-                    info_rects = ()
-
-                # Draw the updates
-                pygame.display.flip()
-            elif not self._is_pause_displayed:
-                self._display_pause_message()
+            if self._is_paused:
+                if not self._is_pause_displayed and not self.is_headless:
+                    profiler.enter('draw')
+                    self._display_pause_message()
+                    self._unsimulated_time = 0.0
+            elif simulation is None:
+                num_ticks = self._simulate_frame(delta_time)
+
+                # Nobody's watching a headless game, so don't draw it, and
+                # don't draw the same thing twice if nothing moved
+                if not self.is_headless and self._is_frame_due(num_ticks):
+                    self._render_frame()
+            else:
+                # Draw the last frame while this one is being simulated
+                snapshot = simulation.get_snapshot()
+                simulation.submit(delta_time)
+                if self._is_frame_due(snapshot.num_ticks):
+                    self._render_frame(snapshot)
+
+                profiler.enter('simulate')
+                try:
+                    simulation.wait()
+                except BaseException:
+                    simulation.stop()
+                    raise
 
             # Handle the player's input
-            self._handle_input(delta_time)
+            profiler.enter('input')
+            was_paused = self._is_paused
+            self._handle_input()
+
+            profiler.enter('wait')
+            if self.is_headless:
+                # Go as fast as possible, pretending time flows steadily
+                self._frame_pacer.wait()
+                delta_time = self._get_headless_delta_time()
+                self._simulated_time += delta_time
+
+                if (self.headless_max_time is not None and
+                    self._simulated_time >= self.headless_max_time):
+                    self._is_main_loop_running = False
+            elif was_paused:
+                # Time spent paused doesn't count
+                self._frame_pacer.resync()
+                delta_time = 0.0
+            else:
+                # Wait for the next frame, keeping a steady frame rate
+                delta_time = self._frame_pacer.wait()
+
+            profiler.end_frame()
+
+        # The last frame simulated hasn't been drawn yet
+        if simulation is not None:
+            simulation.stop()
+            if self._is_main_loop_running:
+                self._render_frame(simulation.get_snapshot())
+
+    def _simulate_frame(self, delta_time):
+        """Simulate a frame that lasted delta_time seconds.
+
+        Return the number of ticks simulated.
+        """
+        if self._simulation_rate is None:
+            self._run_tick(delta_time)
+            return 1
+
+        # Simulate in fixed steps for however long the last frame took,
+        # carrying over what's left for later
+        tick_time = 1.0 / self._simulation_rate
+        self._unsimulated_time = min(self._unsimulated_time + delta_time,
+                                     self._MAX_UNSIMULATED_TIME)
+        num_ticks = 0
+
+        while (self._unsimulated_time >= tick_time and
+               self._is_main_loop_running and
+               self._player.is_alive and self._buildings_left > 0):
+            self._run_tick(tick_time)
+            self._unsimulated_time -= tick_time
+            num_ticks += 1
+
+        return num_ticks
+
+    def _is_frame_due(self, num_ticks):
+        """Return true if a frame that simulated num_ticks should be drawn.
+
+        A frame where nothing moved is skipped, except with vsync, where
+        flipping is what keeps the frame rate in check; without it, the
+        main loop would spin until the next tick came due.
+        """
+        return (num_ticks > 0 or self._needs_full_redraw or
+                self._frame_pacer.mode == gg.framepacer.FramePacer.VSYNC)
+
+    def _simulate_to_snapshot(self, delta_time):
+        """Simulate a frame and return a snapshot of how it ended."""
+        return self._take_snapshot(self._simulate_frame(delta_time))
+
+    def _take_snapshot(self, num_ticks):
+        """Return a FrameSnapshot of everything as it is now.
+
+        The rects are copied, so the snapshot holds while the sprites
+        keep moving on the simulation thread.
+        """
+        sprites = []
+        for group in (self._bomb_group, self._missile_group,
+                      self._enemy_group):
+            sprites.extend([(sprite.image, sprite.rect.copy())
+                            for sprite in group])
+
+        if self._player.is_alive:
+            sprites.append((self._player.image, self._player.rect.copy()))
+
+        razed_buildings = tuple(self._razed_buildings)
+        self._razed_buildings.clear()
+
+        return gg.simulationthread.FrameSnapshot(
+            num_ticks, self._tick_index, tuple(sprites), self._score,
+            self._player.num_lives, self._player.shots_left,
+            razed_buildings)
+
+    def _run_tick(self, delta_time):
+        """Apply the player's input and simulate one tick of the game.
+
+        When playing back a replay, the input comes from the replay
+        instead of the keyboard, and the game ends with the replay.
+        """
+        self._simulation_profiler.enter('input')
+
+        if self._replay_playback is not None:
+            tick_input = self._replay_playback.get_tick(self._tick_index)
+            if tick_input is None:
+                self._is_main_loop_running = False
+                return
+        else:
+            tick_input = gg.replay.Replay.encode_input(
+                self._player.is_moving_left, self._player.is_moving_right,
+                self._is_reload_pending, self._num_pending_shots)
+            self._is_reload_pending = False
+            self._num_pending_shots = 0
+
+            if self._replay_recording is not None:
+                self._replay_recording.add_tick(tick_input)
+
+        self._apply_input(tick_input)
+        self._update_world(delta_time)
+        self._tick_index += 1
+
+    def _apply_input(self, tick_input):
+        """Make the player do what the input byte of a tick says."""
+        (self._player.is_moving_left, self._player.is_moving_right,
+         is_reloading, num_shots) = gg.replay.Replay.decode_input(tick_input)
+
+        # Reload first, in case the player was out of ammo
+        if is_reloading:
+            self._reload()
+
+        for i in range(num_shots):
+            self._shoot()
+
+    def _update_world(self, delta_time):
+        """Move everything and check for collisions."""
+        profiler = self._simulation_profiler
+
+        # Move the player as the last input said
+        profiler.enter('update')
+        if self._player.is_moving_left or self._player.is_moving_right:
+            self._player.update(delta_time)
+
+        # File the bombs and missiles once for all the checks below
+        profiler.enter('collision')
+        self._collision_grid.clear()
+        self._collision_grid.insert_group(self._bomb_group)
+        self._collision_grid.insert_group(self._missile_group)
+
+        # Check if the player is hit by a bomb
+        if self._collision_grid.collide(self._player, self._bomb_group, True):
+            self._player.knock_out()
+
+        # Check for bomb hits on the buildings
+        for building in self._collision_grid.group_collide(
+            self._building_group, self._bomb_group, False, True):
+            if not building.is_razed:
+                building.raze()
+                self._razed_buildings.append(building)
+                self._buildings_left -= 1
+                self._score -= self.score_loss_factor
+                self._session_stats['buildings_lost'] += 1
+
+        # Check for missile hits on the enemies
+        for enemy in self._collision_grid.group_collide(
+            self._enemy_group, self._missile_group, False, True):
+            enemy.knock_out()
+            self._score += self.score_factor
+            self._session_stats['enemies_hit'] += 1
+
+        # Check for missile hits on the bombs
+        for bomb in self._collision_grid.group_collide(
+            self._bomb_group, self._missile_group, True, True):
+            self._score += self.score_factor
+            self._session_stats['bombs_hit'] += 1
+
+        # Move the bad guys and the ammo
+        profiler.enter('update')
+        if self._projectile_engine is not None:
+            self._projectile_engine.update(delta_time)
+        else:
+            self._bomb_group.update(delta_time)
+            self._missile_group.update(delta_time)
+
+        # Only the enemies that are awake are in the group
+        self._enemy_group.update(delta_time)
+
+        # Wake up the enemies and drop the bombs that are due
+        self._scheduler.advance(delta_time)
 
-            # Make sure we don't go above the target frame rate
-            delta_time = self._clock.tick(MAX_FPS) / 1000.0
+    def _render_frame(self, snapshot=None):
+        """Draw a snapshot of the game and show it.
+
+        Without a snapshot, draw everything where it currently is,
+        straight from the sprites.
+        """
+        self._profiler.enter('draw')
+        if snapshot is None:
+            razed_buildings = self._razed_buildings
+            score = self._score
+            num_lives = self._player.num_lives
+            shots_left = self._player.shots_left
+        else:
+            razed_buildings = snapshot.razed_buildings
+            score = snapshot.score
+            num_lives = snapshot.num_lives
+            shots_left = snapshot.shots_left
+
+        # Update the frame; the buildings come with the background
+        building_rects = [self._static_layer.update_sprite(building)
+                          for building in razed_buildings]
+        if snapshot is None:
+            self._razed_buildings.clear()
+        self._clear_frame(building_rects)
+
+        self._update_score_text(score)
+        self._lives_panel.set_count(num_lives)
+        if self._shots_panel is not None:
+            self._shots_panel.set_count(shots_left)
+
+        # Line up everything there is to draw, from back to front, and
+        # hand it all to pygame at once instead of blitting one by one
+        blit_sequence = self._blit_sequence
+        blit_sequence.clear()
+        if snapshot is None:
+            self._add_sprites(blit_sequence, self._bomb_group)
+            self._add_sprites(blit_sequence, self._missile_group)
+            self._add_sprites(blit_sequence, self._enemy_group)
+            if self._player.is_alive:
+                blit_sequence.append((self._player.image,
+                                      self._player.rect))
+        else:
+            blit_sequence.extend(snapshot.sprites)
+        blit_sequence.append((self._score_text, self.score_pos))
+        blit_sequence.append((self._high_score_text, self.high_score_pos))
+        blit_sequence.append(self._lives_panel.get_blit())
+        if self._shots_panel is not None:
+            blit_sequence.append(self._shots_panel.get_blit())
+
+        dirty_rects = self._screen.blits(blit_sequence)
+        dirty_rects += building_rects
+
+        if self._is_screen_info_shown:
+            dirty_rects += self._blit_screen_info(
+                self._frame_pacer.get_fps(),
+                self._frame_pacer.missed_deadlines)
+
+        # Draw the updates
+        self._present_frame(dirty_rects)
+
+    @staticmethod
+    def _add_sprites(blit_sequence, group):
+        """Add every sprite in the group to the sequence of blits."""
+        blit_sequence.extend([(sprite.image, sprite.rect)
+                              for sprite in group])
+
+    def _get_frame_pacing_mode(self):
+        """Return the FramePacer mode that fits the game's settings."""
+        if self.is_headless:
+            return gg.framepacer.FramePacer.UNCAPPED
+        elif (self.frame_pacing == gg.framepacer.FramePacer.VSYNC and
+              not self._is_vsync_on):
+            # Without vsync, we have to keep time ourselves
+            return gg.framepacer.FramePacer.SLEEP
+        return self.frame_pacing
+
+    def _get_headless_delta_time(self):
+        """Return the simulated duration of a headless frame in seconds.
+
+        By default, a headless frame lasts exactly one simulation tick.
+        """
+        if self.headless_delta_time is not None:
+            return self.headless_delta_time
+        elif self._simulation_rate is not None:
+            return 1.0 / self._simulation_rate
+        return 1.0 / self.TARGET_FPS
+
+    def _clear_frame(self, building_rects):
+        """Erase the sprites drawn on the screen in the last frame.
+
+        In dirty-rect mode, only the areas drawn last frame and the
+        buildings that changed are painted over with the background;
+        otherwise, the whole background is blitted.
+        """
+        if self.is_dirty_rect_mode and not self._needs_full_redraw:
+            static_surf = self._static_layer.surface
+            for rect in self._last_dirty_rects:
+                self._screen.blit(static_surf, rect, rect)
+            for rect in building_rects:
+                self._screen.blit(static_surf, rect, rect)
+        else:
+            self._screen.blit(self._static_layer.surface, (0, 0))
+
+    def _present_frame(self, dirty_rects):
+        """Put the frame on the display.
+
+        In dirty-rect mode, only the areas that changed since the last
+        frame are sent to the display, unless they add up to more than
+        dirty_area_threshold of the screen, in which case it's faster to
+        just flip the whole thing.
+        """
+        self._profiler.enter('flip')
+
+        if self.is_dirty_rect_mode and not self._needs_full_redraw:
+            update_rects = self._last_dirty_rects + dirty_rects
+            dirty_area = 0
+            for rect in update_rects:
+                dirty_area += rect.width * rect.height
+
+            if dirty_area > (self.dirty_area_threshold
+                             * self._screen_rect.width
+                             * self._screen_rect.height):
+                pygame.display.flip()
+            else:
+                pygame.display.update(update_rects)
+        else:
+            pygame.display.flip()
+
+        self._last_dirty_rects = dirty_rects
+        self._needs_full_redraw = False
 
     def _init_environment(self):
         """Initialize modules and values necessary to play the game."""
-        pygame.init()
+        # SDL's dummy driver gives us a screen that is never shown, unless
+        # another driver was asked for
+        if self.is_headless and 'SDL_VIDEODRIVER' not in os.environ:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            self._has_set_video_driver = True
+
+        # Start only the parts of pygame the game uses, which is a lot
+        # quicker than pygame.init()
+        pygame.display.init()
+        pygame.font.init()
+        self._init_pygame_modules()
         pygame.mouse.set_visible(False)
+
+        # Fonts from an earlier pygame session can't be used anymore
+        gg.utils._text_cache.clear()
+
+        # Measure each part of the frame only if anyone wants to know
+        if self.is_profiling or self.profile_trace_file is not None:
+            self._profiler = gg.frameprofiler.FrameProfiler(
+                is_tracing=self.profile_trace_file is not None)
+        else:
+            self._profiler = gg.frameprofiler.NullProfiler()
+
         pygame.display.set_caption(self.name)
         pygame.event.set_allowed(None)
         pygame.event.set_allowed([pygame.KEYDOWN, pygame.KEYUP,
@@ -314,17 +706,42 @@ class Game:
             self._set_window_icon()
 
         # Initialize the screen
-        if self.is_fullscreen:
-            scr_flags = pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF
-            self._screen = pygame.display.set_mode((0, 0), scr_flags)
+        if self.is_fullscreen and not self.is_headless:
+            scr_size = (0, 0)
+            scr_flags = pygame.FULLSCREEN
         else:
             self._set_screen_height()
-            self._screen = pygame.display.set_mode((self.screen_width,
-                                                    self._screen_height))
+            scr_size = (self.screen_width, self._screen_height)
+            scr_flags = 0
+
+        self._is_vsync_on = False
+        if (self.frame_pacing == gg.framepacer.FramePacer.VSYNC and
+            not self.is_headless):
+            # SDL only syncs scaled or OpenGL displays with the refresh
+            try:
+                self._screen = pygame.display.set_mode(
+                    scr_size, scr_flags | pygame.SCALED, vsync=1)
+                self._is_vsync_on = True
+            except pygame.error as err:
+                print(gg.utils._ERR_PREFIX, "Couldn't turn on vsync:", err,
+                      file=sys.stderr)
+
+        if not self._is_vsync_on:
+            self._screen = pygame.display.set_mode(scr_size, scr_flags)
         self._screen.set_alpha(None, pygame.RLEACCEL)
         self._screen_rect = self._screen.get_rect()
-        self._screen_font = pygame.font.Font(None, self.screen_font_size)
-        self._modal_text_font = pygame.font.Font(None, 72)
+        self._screen_font = gg.utils._get_font(self.screen_font_size)
+        self._modal_text_font = gg.utils._get_font(72)
+
+        # Load the game's images in the background while the splash
+        # screen is up, if one is given and anyone can see it
+        self._start_preloading_images()
+
+        if self.splash_image is not None and not self.is_headless:
+            self._display_splash_screen(self._screen)
+
+        self._asset_preloader.finish()
+        self._build_sprite_atlas()
 
         # Initialize the background
         self._background_surf = gg.utils._get_surface(
@@ -342,21 +759,49 @@ class Game:
         # Read the high score
         self._read_high_score()
 
+    def _quit_pygame(self):
+        """Let pygame go, leaving the video driver as it was before."""
+        pygame.quit()
+
+        # Any game started later in the process gets its window back
+        if self._has_set_video_driver:
+            del os.environ['SDL_VIDEODRIVER']
+            self._has_set_video_driver = False
+
     def _init_new_game(self):
         """Initialize the sprites at the beginning of the game."""
+        # Seed the random numbers so the game can be played back later
+        self._init_replay()
+
         # Create the groups
         self._enemy_group = pygame.sprite.LayeredDirty()
         self._missile_group = pygame.sprite.LayeredDirty()
         self._bomb_group = pygame.sprite.LayeredDirty()
         self._building_group = pygame.sprite.RenderUpdates()
-        self._thumbnail_group = pygame.sprite.RenderUpdates()
+        self._static_layer = gg.staticlayer.StaticLayer(self._background_surf)
+        self._needs_full_redraw = True
+
+        # Move all the missiles and bombs with NumPy if asked to
+        if (self.is_vectorized_ammo and
+            gg.projectileengine.ProjectileEngine.is_available()):
+            self._projectile_engine = gg.projectileengine.ProjectileEngine()
+        else:
+            self._projectile_engine = None
 
-        # Get the groups ready for drawing
-        self._enemy_group.clear(self._screen, self._background_surf)
-        self._missile_group.clear(self._screen, self._background_surf)
-        self._bomb_group.clear(self._screen, self._background_surf)
-        self._building_group.clear(self._screen, self._background_surf)
-        self._thumbnail_group.clear(self._screen, self._background_surf)
+            if self.is_vectorized_ammo:
+                print(gg.utils._ERR_PREFIX, "NumPy isn't installed, so the",
+                      'ammo will be moved one by one.', file=sys.stderr)
+
+        # Build the missiles ahead of time so firing doesn't create them
+        if self.player_num_shots > 0:
+            missile_pool_size = self.player_num_shots
+        else:
+            missile_pool_size = self._DEFAULT_AMMO_POOL_SIZE
+
+        self._missile_pool = gg.ammopool.AmmoPool(
+            self._missile_group, self._screen_rect, self.missile_image,
+            self.images_dir, self.is_missile_upward, self.missile_speed,
+            missile_pool_size, engine=self._projectile_engine)
 
         # Data to pass to the player to create missiles
         missile_data = {
@@ -366,6 +811,7 @@ class Game:
             'image_dir': self.images_dir,
             'is_direction_up': self.is_missile_upward,
             'speed': self.missile_speed,
+            'pool': self._missile_pool,
         }
 
         # Put the player 75% of the way down the screen
@@ -390,6 +836,13 @@ class Game:
 
         enemy_boundaries = (self.enemy_top_edge, self.enemy_bottom_edge)
 
+        # One bomb per enemy is usually enough; the pool grows if not
+        self._bomb_pool = gg.ammopool.AmmoPool(
+            self._bomb_group, self._screen_rect, self.bomb_image,
+            self.images_dir, not self.is_bomb_downward, self.bomb_speed,
+            max(self.enemy_count, self._DEFAULT_AMMO_POOL_SIZE),
+            engine=self._projectile_engine)
+
         # Data to pass to the enemies to create bombs
         bomb_data = {
             'group': self._bomb_group,
@@ -398,13 +851,16 @@ class Game:
             'image_dir': self.images_dir,
             'is_direction_up': self.is_bomb_downward,
             'speed': self.bomb_speed,
+            'pool': self._bomb_pool,
         }
 
-        # Create these stinkin' guys
+        # Create these stinkin' guys; they wake up and drop their bombs
+        # when the scheduler tells them to
+        self._scheduler = gg.scheduler.Scheduler()
         for i in range(self.enemy_count):
             gg.enemy.Enemy(self._enemy_group, bomb_data, self._screen_rect,
                            enemy_boundaries, self.enemy_image, self.images_dir,
-                           self.enemy_speed)
+                           self.enemy_speed, self._rng, self._scheduler)
 
         # Place the buildings at regular intervals
         building_rect = gg.utils._load_image(self.building_image,
@@ -429,20 +885,30 @@ class Game:
 
             building_x_pos += building_interval + building_width
 
+        # The buildings never move, so draw them once into the background
+        for building in self._building_group:
+            self._static_layer.add(building)
+
         # Keep track of the buildings we lose
         self._buildings_left = self.building_count
+        self._razed_buildings = []
+        self._simulated_time = 0.0
 
-        # Reset the score
+        # Reset the score and the stats
         self._score = 0
+        self._session_stats = {'shots': 0, 'enemies_hit': 0, 'bombs_hit': 0,
+                               'buildings_lost': 0}
+        self._session_start_time = time.perf_counter()
 
         # First call, to ensure it works properly later
-        self._blit_current_score(True)
+        self._shown_score = None
+        self._update_score_text(self._score)
 
         # Position the high score
         high_score_text = ''.join(['High score: ', str(self._high_score)])
-        self._high_score_text = self._screen_font.render(high_score_text, True,
-                                                         self.font_color)
-        self._high_score_rect = self._high_score_text.get_rect()
+        self._high_score_text, self._high_score_rect = \
+            gg.utils._get_rendered_text(self._screen_font, high_score_text,
+                                        self.font_color)
 
         if self.high_score_pos is None:
             self._high_score_rect.centerx = self._screen_rect.centerx
@@ -450,32 +916,85 @@ class Game:
 
         self._high_score_rect.topleft = self.high_score_pos
 
-        # Create the thumbnails for the number of lives
-        self._create_thumbnails(self._player_thumbnails, self.num_lives_pos,
-                                self.player_image, self.player_num_lives)
+        # Create the panel for the number of lives
+        self._lives_panel = gg.hudpanel.HudPanel(
+            self.num_lives_pos, self.thumbnails_height, self.player_image,
+            self.images_dir, self._player.num_lives,
+            max_width=self._screen_rect.width)
 
-        # Create the thumbnails for the number of shots if not unlimited
+        # Create the panel for the number of shots if not unlimited
         if self._player.MAX_SHOTS > 0:
-            self._create_thumbnails(self._missile_thumbnails,
-                                    self.num_shots_pos, self.missile_image,
-                                    self._player.shots_left)
-
-    def _create_thumbnails(self, thumb_list, pos, image_file, num_thumbs):
-        """Create the thumbnails and add them to their container."""
-        for i in range(num_thumbs):
-            if i == 0:
-                thumbnail_pos = pos
+            self._shots_panel = gg.hudpanel.HudPanel(
+                self.num_shots_pos, self.thumbnails_height,
+                self.missile_image, self.images_dir, self._player.shots_left,
+                max_width=self._screen_rect.width)
+        else:
+            self._shots_panel = None
+
+    def _init_replay(self):
+        """Seed the game's random numbers and set up the replay, if any.
+
+        A replay being played back dictates the seed and the simulation
+        rate. Recording needs a fixed simulation rate to be exact.
+        """
+        self._replay_playback = None
+        self._replay_recording = None
+        self._tick_index = 0
+        self._num_pending_shots = 0
+        self._is_reload_pending = False
+
+        # A replay's rate is for that game only, so it's kept apart from
+        # the one the game was given
+        self._simulation_rate = self.simulation_rate
+
+        if self.replay_play_file is not None:
+            try:
+                self._replay_playback = gg.replay.Replay.load(
+                    self.replay_play_file)
+            except (OSError, ValueError) as err:
+                print(gg.utils._ERR_PREFIX, "Couldn't play the replay:", err,
+                      file=sys.stderr)
+
+        if self._replay_playback is not None:
+            seed = self._replay_playback.seed
+            self._simulation_rate = self._replay_playback.simulation_rate
+
+            if self._replay_playback.screen_size != self._screen_rect.size:
+                print(gg.utils._ERR_PREFIX, 'The replay was recorded on a',
+                      'different screen size, so it will play differently.',
+                      file=sys.stderr)
+        elif self.seed is None:
+            seed = random.randrange(2 ** 32)
+        elif not isinstance(self.seed, int):
+            print(gg.utils._ERR_PREFIX, 'The seed must be a whole number,',
+                  'so a new one will be picked.', file=sys.stderr)
+            seed = random.randrange(2 ** 32)
+        elif not 0 <= self.seed < 2 ** 32:
+            # Replays only have room for 32 bits
+            seed = self.seed % 2 ** 32
+            print(gg.utils._ERR_PREFIX, 'The seed must be from 0 to',
+                  2 ** 32 - 1, 'so', seed, 'will be used instead.',
+                  file=sys.stderr)
+        else:
+            seed = self.seed
+
+        self._rng = random.Random(seed)
+
+        if self.replay_record_file is not None:
+            if self._simulation_rate is None:
+                print(gg.utils._ERR_PREFIX, "Can't record a replay without",
+                      'a fixed simulation_rate.', file=sys.stderr)
             else:
-                thumbnail_pos = (thumbnail_pos[0]
-                                 + last_thumbnail.rect.width + 6,
-                                 thumbnail_pos[1])
+                self._replay_recording = gg.replay.Replay(
+                    seed, self._simulation_rate, self._screen_rect.size)
 
-            last_thumbnail = gg.thumbnail.Thumbnail(self._thumbnail_group,
-                                                    thumbnail_pos,
-                                                    self.thumbnails_height,
-                                                    image_file,
-                                                    self.images_dir)
-            thumb_list.append(last_thumbnail)
+    def _save_replay(self):
+        """Write the recording of the game that just ended to its file."""
+        try:
+            self._replay_recording.save(self.replay_record_file)
+        except OSError as err:
+            print(gg.utils._ERR_PREFIX, "Couldn't save the replay:", err,
+                  file=sys.stderr)
 
     def _set_window_icon(self):
         """Change the default pygame icon on the game window."""
@@ -523,7 +1042,10 @@ class Game:
                                      'a full-screen image')[0]
         image_width, image_height = image.get_size()
         image_aspect_ratio = image_width / image_height
-        image.set_alpha(None, pygame.RLEACCEL)
+
+        # A full-screen image is used just once, so it shouldn't take up
+        # room in the image cache for the rest of the game
+        gg.utils._image_cache.invalidate(file_name, self.images_dir)
 
         if image_width != screen_width or image_height != screen_height:
             if screen_aspect_ratio == image_aspect_ratio:
@@ -540,14 +1062,74 @@ class Game:
                 image = pygame.transform.smoothscale(image, image_size)
             except ValueError:
                 image = pygame.transform.scale(image, image_size)
+        else:
+            # Whoever loaded the image may still be using it
+            image = image.copy()
 
+        image.set_alpha(None, pygame.RLEACCEL)
         image_rect = image.get_rect()
         image_rect.center = self._screen_rect.center
 
         return image, image_rect
 
+    def _init_pygame_modules(self):
+        """Start the extra pygame modules asked for in pygame_modules."""
+        for module_name in self.pygame_modules:
+            try:
+                getattr(pygame, module_name).init()
+            except (AttributeError, pygame.error) as err:
+                print(gg.utils._ERR_PREFIX, "Couldn't start pygame's",
+                      module_name, 'module:', err, file=sys.stderr)
+
+    def _start_preloading_images(self):
+        """Start decoding every image the game uses on other threads."""
+        self._asset_preloader = gg.assetpreloader.AssetPreloader()
+
+        for file_name in (self.background_image, self.player_image,
+                          self.enemy_image, self.missile_image,
+                          self.bomb_image, self.building_image,
+                          self.building_razed_image):
+            self._asset_preloader.add(file_name, self.images_dir)
+
+        self._asset_preloader.start()
+
+    def _build_sprite_atlas(self):
+        """Pack the sprite images and their variants into a texture atlas.
+
+        The mirror images of the player and the enemies and the
+        thumbnails of the player and the missiles are made here, ahead of
+        time, so they go on the atlas too. Images that couldn't be loaded
+        are left out, and reported when the sprites are created.
+        """
+        conversion = gg.imagecache.ImageCache.CONVERT_AUTO
+        sprite_files = (self.player_image, self.enemy_image,
+                        self.missile_image, self.bomb_image,
+                        self.building_image, self.building_razed_image)
+        keys = [(self.images_dir, file_name, conversion)
+                for file_name in sprite_files if file_name is not None]
+
+        image_cache = gg.utils._image_cache
+        for file_name in (self.player_image, self.enemy_image):
+            if (self.images_dir, file_name, conversion) in image_cache:
+                gg.utils._load_image_orientations(file_name, self.images_dir)
+                keys.append((self.images_dir, file_name,
+                             (conversion, 'flipped_x')))
+
+        for file_name in (self.player_image, self.missile_image):
+            if (self.images_dir, file_name, conversion) in image_cache:
+                gg.utils._load_scaled_image(file_name, self.thumbnails_height,
+                                            self.images_dir)
+                keys.append((self.images_dir, file_name,
+                             (conversion, 'height', self.thumbnails_height)))
+
+        self._sprite_atlas = gg.utils._pack_cached_images(keys)
+
     def _display_splash_screen(self, screen):
-        """Display a splash screen until a key, any key, is pressed."""
+        """Display a splash screen until a key, any key, is pressed.
+
+        Meanwhile, the images being preloaded are converted as soon as
+        they're ready.
+        """
         image, img_rect = self._fit_image_to_screen(self.splash_image)
 
         screen.blit(image, img_rect)
@@ -556,7 +1138,14 @@ class Game:
         # Detect if the player quit or if a key was pressed and released
         is_screen_done = False
         while not is_screen_done:
-            for event in pygame.event.get():
+            self._asset_preloader.convert_ready()
+
+            if self._asset_preloader.is_done():
+                timeout = 250
+            else:
+                timeout = 20
+
+            for event in gg.utils._wait_for_events(timeout):
                 if self._has_quit(event):
                     self._handle_quit()
                     is_screen_done = True
@@ -585,63 +1174,77 @@ class Game:
         self._screen.blit(text, text_rect)
         pygame.display.update([text_shadow_rect, text_rect])
 
-    def _handle_input(self, delta_time):
-        """React to the player's input as necessary."""
-        for event in pygame.event.get():
+    def _handle_input(self):
+        """React to the player's input as necessary.
+
+        Nothing moves while the pause message is up, so the game just
+        sleeps until the player does something.
+        """
+        if self._is_pause_displayed and not self.is_headless:
+            events = gg.utils._wait_for_events()
+        else:
+            events = pygame.event.get()
+
+        for event in events:
             if self._has_quit(event):
                 self._handle_quit()
                 return
             elif event.type == pygame.KEYDOWN:
-                if event.key in self.keys_shoot and not self._is_paused:
-                    self._player.shoot()
-                    if len(self._missile_thumbnails) > 0:
-                        self._thumbnail_group.remove(
-                            self._missile_thumbnails.pop())
+                if (event.key in self.keys_shoot and not self._is_paused and
+                    self._replay_playback is None):
+                    # Shoot on the next tick
+                    self._num_pending_shots += 1
                 elif event.key in self.keys_pause:
                     # Toggle paused state
                     self._is_paused = not self._is_paused
                     if self._is_pause_displayed:
                         self._is_pause_displayed = False
+                        self._needs_full_redraw = True
                 elif event.key == pygame.K_F1:
                     self._is_screen_info_shown = not self._is_screen_info_shown
             elif (event.type == pygame.KEYUP and
                   event.key in self.keys_reload_ammo and
-                  not self._is_paused):
-                # Detect ammo reload when the reload key is released
-                self._player.reload()
-
-                # Update the ammo thumbs if not at max and not unlimited
-                if (self._player.shots_left < self._player.MAX_SHOTS or
-                    self._player.MAX_SHOTS > 0):
-                    for i in range(len(self._missile_thumbnails)):
-                        self._thumbnail_group.remove(
-                            self._missile_thumbnails.pop())
-                    self._create_thumbnails(self._missile_thumbnails,
-                                            self.num_shots_pos, self.missile_image,
-                                            self._player.shots_left)
+                  not self._is_paused and self._replay_playback is None):
+                # Detect ammo reload when the reload key is released, and
+                # reload on the next tick
+                self._is_reload_pending = True
 
-        if self._is_paused:
+        # The keyboard doesn't move the player during a replay
+        if self._is_paused or self._replay_playback is not None:
             return
 
         # Detect left and right movement inputs
         self._keyboard_state = pygame.key.get_pressed()
-        player_rect = self._player.rect
+        self._set_player_direction(self._is_key_active(self.keys_move_left),
+                                   self._is_key_active(self.keys_move_right))
 
-        self._player.is_moving_left = (
-            self._is_key_active(self.keys_move_left) and player_rect.left > 0)
+    def _set_player_direction(self, is_moving_left, is_moving_right):
+        """Make the player move as asked, but never off the screen.
 
+        Everything that moves the player, from the keyboard to a bot,
+        goes through here.
+        """
+        player_rect = self._player.rect
+        self._player.is_moving_left = (is_moving_left and
+                                       player_rect.left > 0)
         self._player.is_moving_right = (
-            self._is_key_active(self.keys_move_right) and
-            player_rect.right < self._screen_rect.right)
+            is_moving_right and player_rect.right < self._screen_rect.right)
 
         # Avoid moving to both left and right at the same time :O
         if self._player.is_moving_left and self._player.is_moving_right:
             self._player.is_moving_left = False
             self._player.is_moving_right = False
 
-        # Update the player
-        if self._player.is_moving_left or self._player.is_moving_right:
-            self._player.update(delta_time)
+    def _shoot(self):
+        """Make the player fire a missile and count the shot."""
+        if self._player.shots_left > 0:
+            self._session_stats['shots'] += 1
+
+        self._player.shoot()
+
+    def _reload(self):
+        """Make the player reload."""
+        self._player.reload()
 
     def _is_key_active(self, event_keys):
         """Return true if one the keys to a particular event is down."""
@@ -651,27 +1254,39 @@ class Game:
                 return True
         return False
 
-    def _blit_current_score(self, has_changed):
-        """Blit the player's current score to the screen."""
-        if has_changed:
-            score_text = ''.join(['Score: ', str(self._score)])
-            self._score_text = self._screen_font.render(score_text, True,
-                                                        self.font_color)
-            self._score_rect = self._score_text.get_rect()
+    def _update_score_text(self, score):
+        """Render the score given unless it's the one already shown."""
+        if score != self._shown_score:
+            self._shown_score = score
+            score_text = ''.join(['Score: ', str(score)])
+            self._score_text, self._score_rect = gg.utils._get_rendered_text(
+                self._screen_font, score_text, self.font_color)
             self._score_rect.topleft = self.score_pos
 
-        self._screen.blit(self._score_text, self.score_pos)
-
-    def _blit_screen_info(self, fps):
+    def _blit_screen_info(self, fps, num_missed_frames=0):
         """Blit the screen resolution and current FPS to the screen.
 
-        This method is not optimized for speed.
+        The FPS line also tells how many frames missed their deadline.
+        When profiling, the average and worst time of each part of the
+        frame go above the FPS. This method is not optimized for speed.
         """
         left_margin = 10
-        bottom_offset = self._screen_rect.height - 70
+        phase_rects = []
+        phase_stats = self._profiler.get_stats()
+        bottom_offset = self._screen_rect.height - 70 - 30 * len(phase_stats)
+        for phase, average_time, worst_time in phase_stats:
+            phase_text = ''.join([phase, ': ',
+                                  '{:.2f}'.format(average_time * 1000), ' / ',
+                                  '{:.2f}'.format(worst_time * 1000), ' ms'])
+            phase_rects.append(self._blit_info_text(
+                phase_text, (left_margin, bottom_offset), False))
+            bottom_offset += 30
+
         fps = str(round(fps, 1))
-        fps_rect = self._blit_info_text(''.join(['FPS: ' + fps]),
-                                        (left_margin, bottom_offset))
+        fps_rect = self._blit_info_text(''.join(['FPS: ', fps, ' (',
+                                                 str(num_missed_frames),
+                                                 ' missed)']),
+                                        (left_margin, bottom_offset), False)
 
         bottom_offset = self._screen_rect.height - 40
         screen_res = ''.join([str(self._screen_rect.width), 'x',
@@ -679,45 +1294,53 @@ class Game:
         screen_res_rect = self._blit_info_text(''.join(['Screen size: ',
                                                         screen_res]),
                                                (left_margin, bottom_offset))
-        return [fps_rect, screen_res_rect]
+        return phase_rects + [fps_rect, screen_res_rect]
+
+    def _save_profile_trace(self):
+        """Save the profile of every frame of the last game."""
+        try:
+            self._profiler.save_trace(self.profile_trace_file)
+        except OSError as e:
+            print(gg.utils._ERR_PREFIX, 'Could not save the profile trace:',
+                  e, file=sys.stderr)
 
-    def _blit_info_text(self, text, pos):
-        """Blit text info to the screen and return the rect."""
-        text_surf = self._screen_font.render(text, True, self.font_color)
-        self._screen.blit(text_surf, pos)
-        return text_surf.get_rect().move(pos)
+    def _blit_info_text(self, text, pos, is_cached=True):
+        """Blit text info to the screen and return the rect.
+
+        Text that changes every frame, like the FPS, would only push the
+        HUD text out of the text cache, so it's rendered without it.
+        """
+        if is_cached:
+            text_surf = gg.utils._get_rendered_text(self._screen_font, text,
+                                                    self.font_color)[0]
+        else:
+            text_surf = self._screen_font.render(text, True, self.font_color)
+        return self._screen.blit(text_surf, pos)
 
     def _read_high_score(self):
-        """Read the high score from the file.
+        """Read the high score from the leaderboard.
 
-        If the file doesn't exist yet, the high score is assumed to be
-        0, and the file will be created later.
+        If there's no leaderboard yet, the high score is assumed to be
+        0, and the files will be created later.
         """
-        if os.path.isfile(self._data_file):
-            with open(self._data_file, 'rb') as file:
-                file_content = file.read(4)
-                self._high_score = struct.unpack('I', file_content)[0]
-
-    def _update_high_score(self):
-        """Write the high score to the file."""
-        self._high_score = self._score
-
-        # Thanks to Blair Conrad at Stack Overflow for this algorithm
-        # https://stackoverflow.com/questions/273192/how-can-i-create-a-
-        # directory-if-it-does-not-exist
-        if not os.path.exists(self._data_dir):
-            try:
-                os.makedirs(self._data_dir)
-            except OSError as error:
-                if error.errno != errno.EEXIST:
-                    print(_ERR_PREFIX, "Couldn't create the", self._data_dir,
-                          'folder to record the high score :(',
-                          file=sys.stderr)
-                    return
-
-        with open(self._data_file, 'wb') as file:
-            binary_score = struct.pack('I', self._high_score)
-            file.write(binary_score)
+        self._score_store = gg.scorestore.ScoreStore(self._data_dir)
+        self._score_store.load()
+        self._high_score = self._score_store.get_high_score()
+
+    def _record_session(self):
+        """Save the score and stats of the game that just ended.
+
+        The files are written in the background, so this returns right
+        away.
+        """
+        session = dict(self._session_stats)
+        session['end_time'] = time.time()
+        session['duration'] = time.perf_counter() - self._session_start_time
+        session['score'] = self._score
+        self._score_store.record_session(session)
+
+        if self._score > self._high_score:
+            self._high_score = self._score
 
     def _prompt_play_again(self):
         """Wait for the player to indicate if he wants to try again."""
@@ -733,7 +1356,7 @@ class Game:
         # Wait for the keypress to play again
         is_waiting = True
         while is_waiting:
-            for event in pygame.event.get():
+            for event in gg.utils._wait_for_events():
                 if self._has_quit(event):
                     self._handle_quit()
                     is_waiting = False
@@ -755,8 +1378,13 @@ class Game:
 
     def _handle_quit(self):
         """Ask the player for confirmation before exiting the game."""
-        with gg.polardialogbox.PolarDialogBox(self._screen, self._clock)\
-             as box:
+        # There's no one to ask in a headless game, so just quit
+        if self.is_headless:
+            self._is_still_playing = False
+            self._is_main_loop_running = False
+            return
+
+        with gg.polardialogbox.PolarDialogBox(self._screen) as box:
             is_sure_quit = box.get_answer('Are you sure you want to quit?')
 
         if is_sure_quit:
@@ -764,9 +1392,17 @@ class Game:
             self._is_main_loop_running = False
             return
 
+        # The time spent in the dialog box doesn't count as a frame
+        if self._frame_pacer is not None:
+            self._frame_pacer.resync()
+
         if self._is_paused:
             self._is_paused = False
 
-        if self._background_surf is not None:
+        if self._static_layer is not None:
+            self._screen.blit(self._static_layer.surface, (0, 0))
+            pygame.display.flip()
+            self._needs_full_redraw = True
+        elif self._background_surf is not None:
             self._screen.blit(self._background_surf, (0, 0))
             pygame.display.flip()
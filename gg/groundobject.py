@@ -21,17 +21,26 @@ class GroundObject(pygame.sprite.Sprite):
         pygame.sprite.Sprite.__init__(self, group)
         self.image, self.rect = gg.utils._load_image(image_file, image_dir,
                                                      'a ground object')
-        self._razed_image_file = razed_image_file
-        self._image_dir = image_dir
         self.is_razed = False
         self.rect.topleft = pos
+        self._is_razed_shown = False
+
+        if razed_image_file is None:
+            self._razed_image = None
+        else:
+            self._razed_image = gg.utils._load_image(
+                razed_image_file, image_dir, 'a razed ground object')[0]
 
     def update(self):
         """Check if the building is still standing."""
-        if self.is_razed:
-            if self._razed_image_file is None:
+        if self.is_razed and not self._is_razed_shown:
+            self._is_razed_shown = True
+            if self._razed_image is None:
                 self.kill()
             else:
-                self.image = gg.utils._load_image(self._razed_image_file,
-                                                  self._image_dir,
-                                                  'a razed ground object')[0]
+                self.image = self._razed_image
+
+    def raze(self):
+        """Knock the ground object down right away."""
+        self.is_razed = True
+        self.update()
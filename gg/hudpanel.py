@@ -0,0 +1,98 @@
+# hudpanel.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import pygame
+import gg.utils
+
+
+class HudPanel:
+    """A row of thumbnails that shows how many lives or shots are left.
+
+    The thumbnail image is scaled once, and the whole row is drawn once
+    on a single surface; showing fewer or more thumbnails only changes
+    how much of that surface is blitted. That makes drawing the panel,
+    or changing its count, cost the same whether it shows 3 thumbnails
+    or 300.
+
+    The row never gets wider than max_width (if given), since anything
+    past the edge of the screen can't be seen anyway.
+    """
+
+    def __init__(self, pos, new_height, image_file, image_dir=None, count=0,
+                 spacing=6, max_width=None):
+        """Scale the thumbnail and draw the row."""
+        self.pos = pos
+        self.spacing = spacing
+        self.max_width = max_width
+        self.count = 0
+        self._thumbnail, self._thumbnail_rect = gg.utils._load_scaled_image(
+            image_file, new_height, image_dir, 'a thumbnail')
+        self._strip = None
+        self._strip_capacity = 0
+        self._max_count = None
+        self._area = pygame.Rect(0, 0, 0, self._thumbnail_rect.height)
+
+        step = self._thumbnail_rect.width + spacing
+        if max_width is not None and step > 0:
+            self._max_count = (max_width + spacing) // step + 1
+
+        self._build_strip(count)
+        self.set_count(count)
+
+    def set_count(self, count):
+        """Show that many thumbnails from now on."""
+        count = max(count, 0)
+        if (count > self._strip_capacity and
+            (self._max_count is None or
+             self._strip_capacity < self._max_count)):
+            self._build_strip(count)
+
+        self.count = count
+        self._area.width = self._get_row_width(min(count,
+                                                   self._strip_capacity))
+
+    def draw(self, surface):
+        """Blit the thumbnails on the surface and return the rect drawn."""
+        return surface.blit(self._strip, self.pos, self._area)
+
+    def get_blit(self):
+        """Return the (source, dest, area) tuple that draws the panel.
+
+        It's meant for Surface.blits(), to draw the panel along with
+        other things in a single call.
+        """
+        return (self._strip, self.pos, self._area)
+
+    def _build_strip(self, count):
+        """Draw a row of thumbnails long enough to show the count."""
+        if self._max_count is not None:
+            count = min(count, self._max_count)
+
+        # Copy the thumbnail's alpha into the transparent row instead of
+        # blending it, so the row looks exactly like separate thumbnails
+        thumbnail = self._thumbnail
+        if thumbnail.get_flags() & pygame.SRCALPHA:
+            thumbnail = thumbnail.copy()
+            thumbnail.set_alpha(None)
+
+        step = self._thumbnail_rect.width + self.spacing
+        self._strip = pygame.Surface((max(self._get_row_width(count), 1),
+                                      self._thumbnail_rect.height),
+                                     pygame.SRCALPHA)
+        for i in range(count):
+            self._strip.blit(thumbnail, (i * step, 0))
+
+        self._strip_capacity = count
+
+    def _get_row_width(self, count):
+        """Return the width of a row of count thumbnails."""
+        if count == 0:
+            return 0
+        return count * self._thumbnail_rect.width + (count - 1) * self.spacing
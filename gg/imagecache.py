@@ -0,0 +1,139 @@
+# imagecache.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import collections
+
+
+class ImageCache:
+    """A memory-bounded store of images that are ready to be blitted.
+
+    Loading an image means reading the file, decoding it, and converting
+    it to the display format, which is way too slow to do every time a
+    missile is fired. The cache keeps the converted images around, keyed
+    by (directory, file name, conversion mode), so each image is loaded
+    only once no matter how many sprites use it.
+
+    When the images stored take up more than max_bytes, the ones used
+    least recently are thrown out until everything fits again. An image
+    bigger than max_bytes by itself is simply never stored.
+
+    The images handed out are shared by everybody who asks for them, so
+    don't draw on them; make a copy first if you need to change one.
+    """
+    CONVERT_AUTO = 'auto'      # convert_alpha() if the image has alpha
+    CONVERT_ALPHA = 'alpha'    # always convert_alpha()
+    CONVERT_OPAQUE = 'opaque'  # always convert()
+    CONVERT_NONE = 'none'      # leave the image as decoded
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """Create an empty cache."""
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._num_bytes = 0
+
+    def __len__(self):
+        """Return the number of images in the cache."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Return true if the key has an image, without counting a hit."""
+        return key in self._entries
+
+    @property
+    def num_bytes(self):
+        """The approximate amount of memory used by the cached images."""
+        return self._num_bytes
+
+    def get(self, key):
+        """Return the image stored under the key, or None if missing."""
+        try:
+            image = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def put(self, key, image):
+        """Store an image, evicting old ones if memory runs short."""
+        image_bytes = self._get_image_bytes(image)
+
+        if key in self._entries:
+            self._remove(key)
+
+        if image_bytes > self.max_bytes:
+            return
+
+        self._entries[key] = image
+        self._num_bytes += image_bytes
+
+        while self._num_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def invalidate(self, file_name=None, directory=None):
+        """Forget cached images so they are reloaded on the next request.
+
+        With no arguments, the whole cache is emptied. Otherwise, only
+        the images matching the file name and/or directory given are
+        removed, in all conversion modes. Return the number of images
+        removed.
+        """
+        if file_name is None and directory is None:
+            num_removed = len(self._entries)
+            self._entries.clear()
+            self._num_bytes = 0
+            return num_removed
+
+        doomed_keys = [key for key in self._entries
+                       if (directory is None or key[0] == directory) and
+                       (file_name is None or key[1] == file_name)]
+
+        for key in doomed_keys:
+            self._remove(key)
+
+        return len(doomed_keys)
+
+    def reset_stats(self):
+        """Set the hit, miss, and eviction counters back to zero."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_stats(self):
+        """Return a dictionary with the cache counters and usage."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._num_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def _remove(self, key):
+        """Take an entry out of the cache and give its memory back."""
+        image = self._entries.pop(key)
+        self._num_bytes -= self._get_image_bytes(image)
+
+    @staticmethod
+    def _get_image_bytes(image):
+        """Return how much memory the pixels of an image take up."""
+        # A subsurface's pitch is that of the whole surface it's part of
+        if image.get_parent() is not None:
+            return image.get_width() * image.get_bytesize() * \
+                image.get_height()
+        return image.get_pitch() * image.get_height()
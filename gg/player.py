@@ -9,6 +9,7 @@
 # this module.
 
 import pygame
+import gg.ammo
 import gg.utils
 
 
@@ -17,6 +18,10 @@ class Player(pygame.sprite.DirtySprite):
 
     The minimum speed value is 100. If a smaller value is passed, it is
     automatically converted to 100.
+
+    The exact horizontal position is kept as a float apart from the rect,
+    so that small steps at high frame rates aren't rounded away. The
+    player never moves past the edges of the screen.
     """
     LEFT = 0
     RIGHT = 1
@@ -28,8 +33,9 @@ class Player(pygame.sprite.DirtySprite):
         pygame.sprite.DirtySprite.__init__(self)
         self.MAX_SHOTS = max_shots
         self.num_lives = num_lives
-        self.image, self.rect = gg.utils._load_image(image_file,
-                                                     image_dir, 'the player')
+        self._images, self.rect = gg.utils._load_image_orientations(
+            image_file, image_dir, 'the player')
+        self.image = self._images[self.RIGHT]
         self.rect.y = y_pos
         self.is_alive = True
         self.is_moving_left = False
@@ -68,30 +74,45 @@ class Player(pygame.sprite.DirtySprite):
                 self._current_dir = self.LEFT
 
             if self._current_dir != self._previous_dir:
-                self.image = pygame.transform.flip(self.image, True, False)
+                self.image = self._images[self._current_dir]
 
             self._previous_dir = self._current_dir
 
         # Move the player
         if self.is_moving_right:
-            self.rect.x += self._speed * delta_time
+            self._x += self._speed * delta_time
+            self.rect.x = self._x
             self.dirty = 1
         elif self.is_moving_left:
-            self.rect.x -= self._speed * delta_time
+            self._x -= self._speed * delta_time
+            self.rect.x = self._x
             self.dirty = 1
 
+        # Stop at the edges of the screen, however long the step was
+        if self.rect.left < self._screen_rect.left:
+            self.rect.left = self._screen_rect.left
+            self._x = float(self.rect.x)
+        elif self.rect.right > self._screen_rect.right:
+            self.rect.right = self._screen_rect.right
+            self._x = float(self.rect.x)
+
     def shoot(self):
-        """Create a new, moving ammo object."""
+        """Fire a new, moving ammo object, from the pool if there is one."""
         if self.shots_left > 0:
-            new_missile = gg.ammo.Ammo(
-                self._missile_data['group'],
-                self._missile_data['screen_rect'],
-                self.rect.center,
-                self._missile_data['image_file'],
-                self._missile_data['image_dir'],
-                self._missile_data['is_direction_up'],
-                self._missile_data['speed']
-            )
+            missile_pool = self._missile_data.get('pool')
+
+            if missile_pool is None:
+                new_missile = gg.ammo.Ammo(
+                    self._missile_data['group'],
+                    self._missile_data['screen_rect'],
+                    self.rect.center,
+                    self._missile_data['image_file'],
+                    self._missile_data['image_dir'],
+                    self._missile_data['is_direction_up'],
+                    self._missile_data['speed']
+                )
+            else:
+                missile_pool.acquire(self.rect.center)
 
             if self.MAX_SHOTS > 0:
                 self.shots_left -= 1
@@ -117,3 +138,5 @@ class Player(pygame.sprite.DirtySprite):
             self.rect.centerx = self._screen_rect.centerx
         else:
             self.rect.x = self._initial_x_pos
+
+        self._x = float(self.rect.x)
@@ -10,6 +10,7 @@
 
 import pygame
 import gg.colors
+import gg.utils
 
 
 class PolarDialogBox:
@@ -25,8 +26,12 @@ class PolarDialogBox:
     YES_BUTTON = 0
     NO_BUTTON = 1
 
-    def __init__(self, screen, clock, size=(400, 200)):
-        """Initializes the values of the box."""
+    def __init__(self, screen, clock=None, size=(400, 200)):
+        """Initializes the values of the box.
+
+        The clock is ignored, since the box sleeps until there's input;
+        it's only kept so code that passes one still works.
+        """
         self.size = size
         self.font_size = 28
         self.font_color_prompt = gg.colors.MEDIUM_DARK_GRAY
@@ -39,14 +44,14 @@ class PolarDialogBox:
         self.shadow_y_offset = 3
         self._screen = screen
         self._screen_rect = screen.get_rect()
-        self._clock = clock
-        self._font = pygame.font.Font(None, self.font_size)
+        self._font = gg.utils._get_font(self.font_size)
         self._box_rect = None
         self._button_yes_rect = None
         self._button_no_rect = None
         self._button_ctr_offset = 20
         self._focused_button = self.YES_BUTTON
         self._active_button = None
+        self._buttons = {}
 
         if (pygame.event.get_blocked(pygame.KEYDOWN) or
             pygame.event.get_blocked(pygame.MOUSEMOTION) or
@@ -70,19 +75,22 @@ class PolarDialogBox:
         """Display the dialog box and wait for the user's response.
 
         The return value is true if the answer is yes, false otherwise.
+        The buttons are redrawn only when their look changes, and the
+        box sleeps while waiting for the user.
         """
         self._render_box(prompt_text)
+        button_state = None
 
         while True:
-            self._render_buttons()
+            if button_state != (self._focused_button, self._active_button):
+                self._render_buttons()
+                button_state = (self._focused_button, self._active_button)
+
             is_answer_yes = self._get_input()
 
             if is_answer_yes is not None:
                 return is_answer_yes
 
-            if self._clock is not None:
-                self._clock.tick(60)
-
     def _render_box(self, prompt_text):
         """Draw the dialog box centered on the screen."""
         box, box_rect = gg.utils._get_surface(self.size, self.background_color)
@@ -128,10 +136,37 @@ class PolarDialogBox:
         pygame.display.update([button_yes_rect, button_no_rect])
 
     def _get_button(self, text, button_specifier):
-        """Return a button surface containing the text."""
+        """Return a button surface containing the text.
+
+        Each look of each button is drawn only the first time it's
+        needed; the rect returned is a new one every time.
+        """
+        is_active = button_specifier == self._active_button
+        is_focused = button_specifier == self._focused_button
+        button_key = (text, is_active, is_focused)
+
+        button = self._buttons.get(button_key)
+        if button is None:
+            button = self._draw_button(text, is_active, is_focused)
+            self._buttons[button_key] = button
+        button_rect = button.get_rect()
+
+        # Position the button in the right place
+        if button_specifier == self.YES_BUTTON:
+            button_rect.right = (self._box_rect.centerx
+                                 - self._button_ctr_offset)
+        else:
+            button_rect.left = self._box_rect.centerx + self._button_ctr_offset
+
+        button_rect.y = self._box_rect.centery + self._button_ctr_offset
+
+        return (button, button_rect)
+
+    def _draw_button(self, text, is_active, is_focused):
+        """Return a new button surface in the look requested."""
         size = (90, 40)
 
-        if button_specifier == self._active_button:
+        if is_active:
             # Invert the colors when active
             background_color = self.font_color_buttons
             text_color = self.button_color_default
@@ -145,20 +180,11 @@ class PolarDialogBox:
         gg.utils._blit_text_to_surface(text, button, text_rect, button_rect)
 
         # Draw the border if this button has the focus
-        if button_specifier == self._focused_button:
+        if is_focused:
             pygame.draw.rect(button, gg.colors.BLACK, button_rect,
                              self.border_width)
 
-        # Position the button in the right place
-        if button_specifier == self.YES_BUTTON:
-            button_rect.right = (self._box_rect.centerx
-                                 - self._button_ctr_offset)
-        else:
-            button_rect.left = self._box_rect.centerx + self._button_ctr_offset
-
-        button_rect.y = self._box_rect.centery + self._button_ctr_offset
-
-        return (button, button_rect)
+        return button
 
     def _get_input(self):
         """Return true if the user answers yes, false otherwise.
@@ -167,7 +193,7 @@ class PolarDialogBox:
         moving focus from one button to another, then the return value
         is None.
         """
-        for event in pygame.event.get():
+        for event in gg.utils._wait_for_events():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_y:
                     self._focused_button = self.YES_BUTTON
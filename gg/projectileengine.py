@@ -0,0 +1,137 @@
+# projectileengine.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ProjectileEngine:
+    """Moves all the missiles and bombs at once using NumPy.
+
+    Calling update() on hundreds of Ammo sprites one by one is slow
+    because of all the Python work involved. The engine keeps the
+    position, speed, and direction of every projectile in NumPy arrays
+    instead, moves them all in a single step, and kills the ones that
+    have left the screen. The sprite rects are then updated so the
+    projectiles can be drawn and collided with as usual; the result is
+    exactly the same as calling Ammo.update() on each of them.
+
+    Projectiles are added to and removed from the engine by their pools
+    (see AmmoPool), so that only the ammo in play gets moved.
+
+    NumPy is optional for GG; check ProjectileEngine.is_available()
+    before creating an engine.
+    """
+
+    def __init__(self, capacity=64):
+        """Allocate the arrays for the projectiles."""
+        self._sprites = []
+        self._free_slots = []
+        self._num_slots = 0
+        self._capacity = 0
+        self._y = None
+        self._height = None
+        self._velocity = None
+        self._bottom_limit = None
+        self._is_up = None
+        self._is_active = None
+        self._grow(capacity)
+
+    def __len__(self):
+        """Return the number of projectiles in play."""
+        return self._num_slots - len(self._free_slots)
+
+    @staticmethod
+    def is_available():
+        """Return true if NumPy can be imported."""
+        return numpy is not None
+
+    def add(self, ammo, screen_rect):
+        """Start moving an ammo object that was just fired."""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._num_slots == self._capacity:
+                self._grow(self._capacity * 2)
+            slot = self._num_slots
+            self._num_slots += 1
+            self._sprites.append(None)
+
+        self._sprites[slot] = ammo
+        self._y[slot] = ammo._y
+        self._height[slot] = ammo.rect.height
+        self._is_up[slot] = ammo._is_direction_up
+        self._bottom_limit[slot] = screen_rect.bottom
+        self._is_active[slot] = True
+
+        if ammo._is_direction_up:
+            self._velocity[slot] = -ammo._speed
+        else:
+            self._velocity[slot] = ammo._speed
+
+        ammo._engine_slot = slot
+
+    def remove(self, ammo):
+        """Stop moving an ammo object that was killed."""
+        slot = ammo._engine_slot
+        if slot is None:
+            return
+
+        self._is_active[slot] = False
+        self._sprites[slot] = None
+        self._free_slots.append(slot)
+        ammo._engine_slot = None
+
+    def update(self, delta_time):
+        """Move all the projectiles and kill the ones off the screen."""
+        num_slots = self._num_slots
+        if num_slots == 0:
+            return
+
+        y = self._y[:num_slots]
+        is_active = self._is_active[:num_slots]
+        is_up = self._is_up[:num_slots]
+
+        # Just like Ammo.update(), ammo whose rect is already off the
+        # screen is killed; rects round half away from zero
+        rect_y = numpy.trunc(y + numpy.copysign(0.5, y))
+        is_gone = is_active & numpy.where(
+            is_up, rect_y + self._height[:num_slots] <= 0,
+            rect_y >= self._bottom_limit[:num_slots])
+        is_moving = is_active & ~is_gone
+
+        moving_slots = numpy.flatnonzero(is_moving)
+        y[moving_slots] += self._velocity[moving_slots] * delta_time
+
+        sprites = self._sprites
+        for slot, sprite_y in zip(moving_slots.tolist(),
+                                  y[moving_slots].tolist()):
+            sprites[slot].rect.y = sprite_y
+
+        for slot in numpy.flatnonzero(is_gone).tolist():
+            sprites[slot].kill()
+
+    def _grow(self, capacity):
+        """Make the arrays big enough to hold more projectiles."""
+        def grown(array, dtype):
+            new_array = numpy.zeros(capacity, dtype)
+            if array is not None:
+                new_array[:self._capacity] = array
+            return new_array
+
+        self._y = grown(self._y, numpy.float64)
+        self._height = grown(self._height, numpy.float64)
+        self._velocity = grown(self._velocity, numpy.float64)
+        self._bottom_limit = grown(self._bottom_limit, numpy.float64)
+        self._is_up = grown(self._is_up, bool)
+        self._is_active = grown(self._is_active, bool)
+        self._capacity = capacity
@@ -0,0 +1,123 @@
+# replay.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import struct
+
+
+class Replay:
+    """A recording of a game that can be played back exactly.
+
+    Everything random in a game comes from a generator seeded with a
+    single number, and the game is simulated in fixed ticks, so all it
+    takes to play a game again exactly as it happened is the seed, the
+    tick rate, and what the player did on every tick. That's all a
+    replay stores; each tick takes a single byte:
+
+    -bit 0: moving left.
+    -bit 1: moving right.
+    -bit 2: reloading.
+    -bits 3 to 7: the number of shots fired (at most 31).
+
+    The screen size is stored too, since where enemies fly depends on
+    it. The rest of the game attributes must be set the same way when
+    playing back as they were when recording.
+    """
+    MOVE_LEFT = 0x01
+    MOVE_RIGHT = 0x02
+    RELOAD = 0x04
+    SHOTS_SHIFT = 3
+    MAX_SHOTS_PER_TICK = 31
+
+    _MAGIC = b'GGRP'
+    _VERSION = 2    # 2: enemies wake up and bomb on a scheduler
+    _HEADER_FORMAT = '<4sBIdHH'
+
+    def __init__(self, seed, simulation_rate, screen_size):
+        """Start an empty recording."""
+        self.seed = seed
+        self.simulation_rate = simulation_rate
+        self.screen_size = tuple(screen_size)
+        self._ticks = bytearray()
+
+    def __len__(self):
+        """Return the number of ticks recorded."""
+        return len(self._ticks)
+
+    @classmethod
+    def encode_input(cls, is_moving_left, is_moving_right, is_reloading,
+                     num_shots):
+        """Pack the player's input for one tick into a single byte."""
+        tick_input = min(num_shots, cls.MAX_SHOTS_PER_TICK) << cls.SHOTS_SHIFT
+
+        if is_moving_left:
+            tick_input |= cls.MOVE_LEFT
+        if is_moving_right:
+            tick_input |= cls.MOVE_RIGHT
+        if is_reloading:
+            tick_input |= cls.RELOAD
+
+        return tick_input
+
+    @classmethod
+    def decode_input(cls, tick_input):
+        """Unpack a tick's input byte.
+
+        Return a tuple with the moving-left, moving-right, and reloading
+        flags, followed by the number of shots.
+        """
+        return (bool(tick_input & cls.MOVE_LEFT),
+                bool(tick_input & cls.MOVE_RIGHT),
+                bool(tick_input & cls.RELOAD),
+                tick_input >> cls.SHOTS_SHIFT)
+
+    def add_tick(self, tick_input):
+        """Record the input byte of the next tick."""
+        self._ticks.append(tick_input)
+
+    def get_tick(self, tick_index):
+        """Return the input byte of a tick, or None past the end."""
+        if tick_index < len(self._ticks):
+            return self._ticks[tick_index]
+        return None
+
+    def save(self, path):
+        """Write the replay to a file."""
+        header = struct.pack(self._HEADER_FORMAT, self._MAGIC, self._VERSION,
+                             self.seed, self.simulation_rate,
+                             self.screen_size[0], self.screen_size[1])
+        with open(path, 'wb') as file:
+            file.write(header)
+            file.write(self._ticks)
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay from a file and return it.
+
+        Raise ValueError if the file isn't a replay GG can play.
+        """
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        header_size = struct.calcsize(cls._HEADER_FORMAT)
+        if len(content) < header_size:
+            raise ValueError(''.join([path, ' is not a GG replay.']))
+
+        magic, version, seed, simulation_rate, width, height = \
+            struct.unpack_from(cls._HEADER_FORMAT, content)
+
+        if magic != cls._MAGIC:
+            raise ValueError(''.join([path, ' is not a GG replay.']))
+        if version != cls._VERSION:
+            raise ValueError(''.join(['Replay version ', str(version),
+                                      ' is not supported.']))
+
+        replay = cls(seed, simulation_rate, (width, height))
+        replay._ticks = bytearray(content[header_size:])
+        return replay
@@ -0,0 +1,71 @@
+# scheduler.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import heapq
+
+
+class Scheduler:
+    """Calls functions when their time in the game comes.
+
+    Instead of having every sprite count down its own timers on every
+    tick, sprites schedule what they want done and when, and the game
+    calls advance() once per tick. The timers are kept in a heap ordered
+    by due time, so a tick only looks at the timers that are due; with
+    nothing due, it costs the same however many timers are waiting.
+
+    Time is game time, in seconds, counted from when the scheduler was
+    created; it only moves forward with advance(). Timers due at the
+    same time run in the order they were scheduled, so a game always
+    plays out the same way.
+    """
+
+    def __init__(self):
+        """Create a scheduler with no timers, at time zero."""
+        self.now = 0.0
+        self._timers = []
+        self._num_scheduled = 0
+
+    def __len__(self):
+        """Return the number of timers waiting, cancelled ones included."""
+        return len(self._timers)
+
+    def schedule(self, delay, callback):
+        """Call the function given delay seconds from now.
+
+        Return the timer, which can be passed to cancel().
+        """
+        timer = [self.now + delay, self._num_scheduled, callback]
+        self._num_scheduled += 1
+        heapq.heappush(self._timers, timer)
+        return timer
+
+    @staticmethod
+    def cancel(timer):
+        """Keep a timer from going off. Cancelling None does nothing."""
+        if timer is not None:
+            timer[2] = None    # the timer is dropped when it comes up
+
+    def advance(self, delta_time):
+        """Move time forward and call the functions that are due.
+
+        Functions may schedule more timers; those due by now are called
+        too. Return the number of functions called.
+        """
+        self.now += delta_time
+        timers = self._timers
+        num_called = 0
+
+        while timers and timers[0][0] <= self.now:
+            callback = heapq.heappop(timers)[2]
+            if callback is not None:
+                callback()
+                num_called += 1
+
+        return num_called
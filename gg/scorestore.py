@@ -0,0 +1,304 @@
+# scorestore.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import os
+import queue
+import struct
+import sys
+import threading
+import gg.utils
+
+
+class ScoreStore:
+    """Keeps the best scores and the stats of every game played on disk.
+
+    Two files are kept in the data directory:
+
+    -sessions.dat: the history, one fixed-size record per game played,
+     with the fields in SESSION_FIELDS. New games are appended.
+    -leaderboard.dat: the index, holding the top max_scores scores and
+     the number of the session each one comes from, best first. It's
+     tiny, so the top scores can be read without going through the
+     history, and the number of sessions is worked out from the size of
+     the history file alone.
+
+    Both files start with a magic number and a format version.
+
+    Writing happens on a background thread, so the disk never holds up
+    the game; the scores in memory are up to date right away. The
+    leaderboard is written to a temporary file, flushed to the disk, and
+    then renamed over the old one, so a crash leaves either the old or
+    the new leaderboard, never half of one. A session record cut short
+    by a crash is ignored. Call close() before exiting to make sure
+    everything has been written.
+
+    The high score file of older versions of GG (game.dat) becomes the
+    first entry of the leaderboard if there's no leaderboard yet.
+    """
+    SESSION_FIELDS = ('end_time', 'duration', 'score', 'shots',
+                      'enemies_hit', 'bombs_hit', 'buildings_lost')
+    NO_SESSION = None
+
+    _VERSION = 1
+    _HEADER_FORMAT = '<4sB'
+    _LEADERBOARD_MAGIC = b'GGLB'
+    _LEADERBOARD_FILE = 'leaderboard.dat'
+    _ENTRY_COUNT_FORMAT = '<H'
+    _ENTRY_FORMAT = '<iI'
+    _UNKNOWN_SESSION = 0xFFFFFFFF
+    _SESSIONS_MAGIC = b'GGSS'
+    _SESSIONS_FILE = 'sessions.dat'
+    _SESSION_FORMAT = '<ddiIIII'
+    _LEGACY_FILE = 'game.dat'
+
+    def __init__(self, data_dir, max_scores=10):
+        """Get ready to keep the scores in the directory given."""
+        self.data_dir = data_dir
+        self.max_scores = max_scores
+        self.num_sessions = 0
+        self._top_scores = []
+        self._queue = queue.Queue()
+        self._writer = None
+
+    def load(self):
+        """Read the leaderboard and count the sessions played so far.
+
+        Files that are missing or unreadable count as empty.
+        """
+        self._top_scores = []
+        self.num_sessions = 0
+
+        try:
+            self._top_scores = self._read_leaderboard()
+        except FileNotFoundError:
+            self._top_scores = self._read_legacy_high_score()
+        except (OSError, ValueError, struct.error) as err:
+            print(gg.utils._ERR_PREFIX, "Couldn't read the high scores:",
+                  err, file=sys.stderr)
+
+        try:
+            history_size = os.path.getsize(self._get_path(
+                self._SESSIONS_FILE))
+        except OSError:
+            return
+
+        header_size = struct.calcsize(self._HEADER_FORMAT)
+        self.num_sessions = max(0, (history_size - header_size)
+                                // struct.calcsize(self._SESSION_FORMAT))
+
+    def get_high_score(self):
+        """Return the best score of all, or 0 if there's none yet."""
+        if self._top_scores:
+            return max(self._top_scores[0][0], 0)
+        return 0
+
+    def get_top_scores(self):
+        """Return the leaderboard as a list of (score, session) tuples.
+
+        The session is the number of the session record the score comes
+        from (see get_sessions()), or NO_SESSION if it isn't known.
+        """
+        return list(self._top_scores)
+
+    def record_session(self, session):
+        """Add a finished game to the history and the leaderboard.
+
+        The session is a dictionary with the fields in SESSION_FIELDS.
+        Return true if the score made it to the leaderboard.
+        """
+        session_num = self.num_sessions
+        self.num_sessions += 1
+
+        score = session['score']
+        top_scores = self._top_scores + [(score, session_num)]
+        top_scores.sort(key=lambda entry: entry[0], reverse=True)
+        self._top_scores = top_scores[:self.max_scores]
+        is_top_score = (score, session_num) in self._top_scores
+
+        record = struct.pack(self._SESSION_FORMAT,
+                             *[session[field]
+                               for field in self.SESSION_FIELDS])
+        self._queue.put((self._append_session, record))
+        if is_top_score:
+            self._queue.put((self._write_leaderboard,
+                             self._pack_leaderboard()))
+
+        self._start_writer()
+        return is_top_score
+
+    def get_sessions(self):
+        """Read the whole history and return it as a list of dictionaries.
+
+        This goes through the entire file, so don't call it during a
+        game. Sessions still waiting to be written aren't included.
+        Raise ValueError if the file isn't a GG history file.
+        """
+        try:
+            with open(self._get_path(self._SESSIONS_FILE), 'rb') as file:
+                content = file.read()
+        except OSError:
+            return []
+
+        if not content:
+            return []
+
+        header_size = self._check_header(content, self._SESSIONS_MAGIC)
+        record_size = struct.calcsize(self._SESSION_FORMAT)
+        end = header_size + (len(content) - header_size) // record_size \
+            * record_size
+
+        return [dict(zip(self.SESSION_FIELDS, values))
+                for values in struct.iter_unpack(self._SESSION_FORMAT,
+                                                 content[header_size:end])]
+
+    def close(self):
+        """Wait until everything recorded has been written to disk."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _start_writer(self):
+        """Start the writer thread if it isn't running yet."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_queued,
+                                            name='gg-score-writer',
+                                            daemon=True)
+            self._writer.start()
+
+    def _write_queued(self):
+        """Write whatever is queued until told to stop."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            write, data = job
+            try:
+                os.makedirs(self.data_dir, exist_ok=True)
+                write(data)
+            except OSError as err:
+                print(gg.utils._ERR_PREFIX, "Couldn't save the scores:", err,
+                      file=sys.stderr)
+
+    def _append_session(self, record):
+        """Add a session record to the end of the history file."""
+        path = self._get_path(self._SESSIONS_FILE)
+        header = struct.pack(self._HEADER_FORMAT, self._SESSIONS_MAGIC,
+                             self._VERSION)
+        record_size = len(record)
+
+        with open(path, 'ab') as file:
+            size = file.tell()
+            if size < len(header):
+                file.truncate(0)
+                file.write(header)
+            elif (size - len(header)) % record_size != 0:
+                # Drop what's left of a record cut short by a crash
+                file.truncate(len(header) + (size - len(header))
+                              // record_size * record_size)
+
+            file.write(record)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _write_leaderboard(self, content):
+        """Replace the leaderboard file with new content, atomically."""
+        path = self._get_path(self._LEADERBOARD_FILE)
+        temp_path = ''.join([path, '.tmp'])
+
+        with open(temp_path, 'wb') as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, path)
+        self._sync_data_dir()
+
+    def _sync_data_dir(self):
+        """Make the renaming of a file in the data directory stick."""
+        try:
+            dir_fd = os.open(self.data_dir, os.O_RDONLY)
+        except OSError:
+            return    # not possible on every system, e.g. Windows
+
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def _pack_leaderboard(self):
+        """Return the leaderboard file content for the current scores."""
+        parts = [struct.pack(self._HEADER_FORMAT, self._LEADERBOARD_MAGIC,
+                             self._VERSION),
+                 struct.pack(self._ENTRY_COUNT_FORMAT, len(self._top_scores))]
+
+        for score, session_num in self._top_scores:
+            if session_num is self.NO_SESSION:
+                session_num = self._UNKNOWN_SESSION
+            parts.append(struct.pack(self._ENTRY_FORMAT, score, session_num))
+
+        return b''.join(parts)
+
+    def _read_leaderboard(self):
+        """Read the leaderboard file and return its entries."""
+        with open(self._get_path(self._LEADERBOARD_FILE), 'rb') as file:
+            content = file.read()
+
+        offset = self._check_header(content, self._LEADERBOARD_MAGIC)
+        num_entries = struct.unpack_from(self._ENTRY_COUNT_FORMAT, content,
+                                         offset)[0]
+        offset += struct.calcsize(self._ENTRY_COUNT_FORMAT)
+
+        top_scores = []
+        for i in range(num_entries):
+            score, session_num = struct.unpack_from(self._ENTRY_FORMAT,
+                                                    content, offset)
+            offset += struct.calcsize(self._ENTRY_FORMAT)
+
+            if session_num == self._UNKNOWN_SESSION:
+                session_num = self.NO_SESSION
+            top_scores.append((score, session_num))
+
+        return top_scores[:self.max_scores]
+
+    def _read_legacy_high_score(self):
+        """Return the old high score file as a leaderboard, if there."""
+        try:
+            with open(self._get_path(self._LEGACY_FILE), 'rb') as file:
+                high_score = struct.unpack('I', file.read(4))[0]
+        except (OSError, struct.error):
+            return []
+
+        return [(high_score, self.NO_SESSION)]
+
+    def _check_header(self, content, magic):
+        """Check the magic number and version and return the header size.
+
+        Raise ValueError if they aren't what GG writes.
+        """
+        header_size = struct.calcsize(self._HEADER_FORMAT)
+        if len(content) < header_size:
+            raise ValueError('The score file is truncated.')
+
+        file_magic, version = struct.unpack_from(self._HEADER_FORMAT, content)
+        if file_magic != magic:
+            raise ValueError('The score file is not a GG score file.')
+        if version != self._VERSION:
+            raise ValueError(''.join(['Score file version ', str(version),
+                                      ' is not supported.']))
+
+        return header_size
+
+    def _get_path(self, file_name):
+        """Return the path of a file in the data directory."""
+        return os.path.join(self.data_dir, file_name)
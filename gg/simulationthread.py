@@ -0,0 +1,115 @@
+# simulationthread.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import collections
+import queue
+import threading
+
+# Everything needed to draw one frame, as it was at the end of the frame:
+# how many ticks were simulated, the number of the next tick, the
+# (image, rect) of every sprite from back to front, the score, the lives
+# and shots left, and the buildings razed since the last snapshot
+FrameSnapshot = collections.namedtuple('FrameSnapshot', [
+    'num_ticks', 'tick_index', 'sprites', 'score', 'num_lives',
+    'shots_left', 'razed_buildings'])
+
+
+class SimulationThread:
+    """Simulates the game on a worker thread, a frame ahead of the drawing.
+
+    Every frame, the main thread hands the simulation of the frame over
+    with submit(), draws the snapshot of the frame before it meanwhile,
+    and then waits for the worker with wait() before handling input.
+    The order is always the same: the simulation of frame N only ever
+    overlaps the drawing of frame N - 1, and the input handled between
+    two frames is seen by the next simulation. So a game plays out
+    exactly as it would on a single thread; it's just shown one frame
+    later. Since blitting and flipping let other threads run, a slow
+    flip no longer holds up the simulation.
+
+    The simulate function given is called on the worker with the frame's
+    duration and must return the frame's FrameSnapshot. Snapshots are
+    double-buffered: the front one is the latest complete snapshot,
+    which the main thread draws, while the worker makes the back one,
+    and wait() swaps them. A snapshot is never changed once made, so it
+    can be drawn while the next one is being made without locks.
+
+    An exception raised by the simulation is raised again by wait().
+    """
+
+    def __init__(self, simulate, first_snapshot):
+        """Get ready to simulate, with a snapshot to draw until then."""
+        self._simulate = simulate
+        self._front_snapshot = first_snapshot
+        self._back_snapshot = None
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = None
+        self._is_busy = False
+
+    def start(self):
+        """Start the worker thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run,
+                                            name='gg-simulation',
+                                            daemon=True)
+            self._thread.start()
+
+    def submit(self, delta_time):
+        """Start simulating a frame that lasted delta_time seconds.
+
+        Call wait() before submitting the next frame.
+        """
+        if self._is_busy:
+            raise RuntimeError('The last frame is still being simulated')
+
+        self._is_busy = True
+        self._jobs.put(delta_time)
+
+    def get_snapshot(self):
+        """Return the snapshot of the last frame completely simulated."""
+        return self._front_snapshot
+
+    def wait(self):
+        """Wait for the frame submitted and return its snapshot."""
+        if self._is_busy:
+            self._is_busy = False
+            err = self._results.get()
+            if err is not None:
+                raise err
+
+            self._front_snapshot, self._back_snapshot = (
+                self._back_snapshot, self._front_snapshot)
+
+        return self._front_snapshot
+
+    def stop(self):
+        """Wait for the frame being simulated, if any, and end the thread."""
+        if self._thread is not None:
+            if self._is_busy:
+                self._is_busy = False
+                self._results.get()
+            self._jobs.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Simulate the frames submitted until told to stop."""
+        while True:
+            delta_time = self._jobs.get()
+            if delta_time is None:
+                return
+
+            try:
+                self._back_snapshot = self._simulate(delta_time)
+            except Exception as err:
+                self._results.put(err)
+            else:
+                self._results.put(None)
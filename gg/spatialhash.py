@@ -0,0 +1,119 @@
+# spatialhash.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+
+class SpatialHash:
+    """A grid that quickly finds which sprites might touch a given one.
+
+    Checking every missile against every enemy, every bomb, etc. takes
+    forever once there are lots of them. Instead, the screen is split
+    into square cells, and each sprite is filed under every cell its rect
+    touches. To find what a sprite collides with, only the sprites filed
+    under the same cells need to be checked.
+
+    Sprites are filed with a tag (any hashable value, usually the group
+    they come from), so that a single grid can serve all the collision
+    checks of a frame. Sprites that have been killed since they were
+    filed are ignored.
+
+    The collide() and group_collide() methods give exactly the same
+    results as pygame.sprite.spritecollide() and groupcollide() with
+    rect collisions, including which sprites get killed.
+    """
+
+    def __init__(self, cell_size=64):
+        """Create an empty grid."""
+        self.cell_size = cell_size
+        self._cells = {}
+
+    def clear(self):
+        """Remove all the sprites from the grid."""
+        self._cells.clear()
+
+    def insert(self, sprite, tag):
+        """File a sprite under the cells its rect touches."""
+        cells = self._cells
+        for key in self._get_cell_keys(sprite.rect, tag):
+            try:
+                cells[key].append(sprite)
+            except KeyError:
+                cells[key] = [sprite]
+
+    def insert_group(self, group, tag=None):
+        """File every sprite in the group; the tag defaults to the group."""
+        if tag is None:
+            tag = group
+
+        for sprite in group:
+            self.insert(sprite, tag)
+
+    def get_candidates(self, rect, tag):
+        """Return the live sprites with the tag filed near the rect.
+
+        These are the only sprites that could possibly collide with the
+        rect, but they don't necessarily do.
+        """
+        candidates = {}
+        cells = self._cells
+
+        for key in self._get_cell_keys(rect, tag):
+            for sprite in cells.get(key, ()):
+                if sprite not in candidates and sprite.alive():
+                    candidates[sprite] = None
+
+        return list(candidates)
+
+    def collide(self, sprite, tag, dokill):
+        """Return the sprites with the tag whose rects touch the sprite.
+
+        If dokill is true, the sprites found are killed.
+        """
+        rect = sprite.rect
+        collisions = [candidate for candidate
+                      in self.get_candidates(rect, tag)
+                      if rect.colliderect(candidate.rect)]
+
+        if dokill:
+            for candidate in collisions:
+                candidate.kill()
+
+        return collisions
+
+    def group_collide(self, group, tag, dokill_group, dokill_tagged):
+        """Find the sprites in the group that touch sprites with the tag.
+
+        Return a dictionary just like pygame.sprite.groupcollide() does:
+        every sprite in the group that was hit is a key, and the list of
+        tagged sprites that hit it is its value.
+        """
+        crashed = {}
+
+        for sprite in group.sprites():
+            collisions = self.collide(sprite, tag, dokill_tagged)
+            if collisions:
+                crashed[sprite] = collisions
+                if dokill_group:
+                    sprite.kill()
+
+        return crashed
+
+    def _get_cell_keys(self, rect, tag):
+        """Return the keys of all the cells that the rect touches."""
+        cell_size = self.cell_size
+        left = rect.left // cell_size
+        top = rect.top // cell_size
+        right = (rect.right - 1) // cell_size
+        bottom = (rect.bottom - 1) // cell_size
+
+        if left == right and top == bottom:
+            return ((tag, left, top),)
+
+        return [(tag, x, y) for x in range(left, right + 1)
+                for y in range(top, bottom + 1)]
@@ -0,0 +1,72 @@
+# staticlayer.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import collections
+import pygame
+
+
+class StaticLayer:
+    """A copy of the background with the immobile sprites baked into it.
+
+    Sprites that never move, like buildings, look exactly the same from
+    one frame to the next, so there's no point in drawing them every
+    frame. Instead, they are painted once onto a copy of the background,
+    and that copy is what gets blitted to the screen. When one of them
+    changes (say, a building gets razed), only the area it covers is
+    painted again.
+    """
+
+    def __init__(self, background):
+        """Make a copy of the background to paint the sprites on."""
+        self.surface = background.copy()
+        self._background = background
+        self._painted_rects = collections.OrderedDict()
+
+    def add(self, sprite):
+        """Bake an immobile sprite into the layer."""
+        self._painted_rects[sprite] = self._get_painted_rect(sprite)
+        self._repaint(self._painted_rects[sprite])
+
+    def update_sprite(self, sprite):
+        """Repaint the area of a sprite that changed its looks or died.
+
+        A sprite no longer in any group is taken out of the layer. Return
+        the rect of the area repainted.
+        """
+        region = self._painted_rects.pop(sprite)
+
+        if sprite.alive():
+            new_rect = self._get_painted_rect(sprite)
+            self._painted_rects[sprite] = new_rect
+            region = region.union(new_rect)
+
+        return self._repaint(region)
+
+    def bake(self):
+        """Paint the whole layer again from scratch."""
+        return self._repaint(self.surface.get_rect())
+
+    def _repaint(self, region):
+        """Paint the background and the sprites inside the region."""
+        region = region.clip(self.surface.get_rect())
+        self.surface.set_clip(region)
+        self.surface.blit(self._background, (0, 0))
+
+        for sprite, painted_rect in self._painted_rects.items():
+            if painted_rect.colliderect(region):
+                self.surface.blit(sprite.image, painted_rect)
+
+        self.surface.set_clip(None)
+        return region
+
+    @staticmethod
+    def _get_painted_rect(sprite):
+        """Return the area that the sprite image covers on the layer."""
+        return pygame.Rect(sprite.rect.topleft, sprite.image.get_size())
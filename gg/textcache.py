@@ -0,0 +1,79 @@
+# textcache.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import pygame
+import gg.imagecache
+
+
+class TextCache:
+    """Shared fonts and a memory-bounded store of rendered text.
+
+    Creating a font means reading and parsing a font file, and rendering
+    text means rasterizing every glyph, so doing either on every frame
+    is a waste when the text hardly ever changes. Fonts are created once
+    per (name, size) by get_font() and kept for as long as the cache is
+    not cleared. Rendered text is kept, keyed by (font, text, color,
+    antialias), in an ImageCache that throws out the surfaces used least
+    recently once they take up more than max_bytes.
+
+    There's no need for a glyph atlas on top of this: SDL_ttf already
+    keeps every glyph it rasterizes, so text that changes all the time,
+    like the score, only costs the blits that put its glyphs together.
+
+    Fonts don't survive pygame.quit(), so call clear() after pygame is
+    initialized again. As with images, the surfaces handed out are
+    shared; don't draw on them.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        """Create an empty cache."""
+        self._fonts = {}
+        self._surfaces = gg.imagecache.ImageCache(max_bytes)
+
+    def __len__(self):
+        """Return the number of rendered texts in the cache."""
+        return len(self._surfaces)
+
+    def get_font(self, size, name=None):
+        """Return the font of the given name and size, loading it once.
+
+        A name of None means pygame's default font.
+        """
+        key = (name, size)
+        font = self._fonts.get(key)
+
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self._fonts[key] = font
+
+        return font
+
+    def render(self, font, text, color, antialias=True):
+        """Return a surface with the text rendered in the font."""
+        color = tuple(color)
+        key = (font, text, color, antialias)
+        text_surf = self._surfaces.get(key)
+
+        if text_surf is None:
+            text_surf = font.render(text, antialias, color)
+            self._surfaces.put(key, text_surf)
+
+        return text_surf
+
+    def clear(self):
+        """Forget every font and rendered text."""
+        self._fonts.clear()
+        self._surfaces.invalidate()
+
+    def get_stats(self):
+        """Return a dictionary with the rendered text cache counters."""
+        stats = self._surfaces.get_stats()
+        stats['fonts'] = len(self._fonts)
+        return stats
@@ -0,0 +1,157 @@
+# textureatlas.py
+#
+# GameGenerator is free to use, modify, and redistribute for any purpose
+# that is both educational and non-commercial, as long as this paragraph
+# remains unmodified and in its entirety in a prominent place in all
+# significant portions of the final code. No warranty, express or
+# implied, is made regarding the merchantability, fitness for a
+# particular purpose, or any other aspect of the software contained in
+# this module.
+
+import pygame
+
+
+class TextureAtlas:
+    """Packs many small images into a few big surfaces, called sheets.
+
+    Images are added under a key, and pack() copies them all onto the
+    sheets and returns a subsurface of a sheet for each key. A subsurface
+    is blitted just like the image it replaces, but its pixels live next
+    to those of every other image on the same sheet, so the game's
+    sprites take up a handful of surfaces instead of dozens.
+
+    A sheet has a single pixel format, alpha, and colorkey, so images
+    only share a sheet with images just like them; those with per-pixel
+    alpha and those with a colorkey end up on different sheets. Images
+    are packed in rows (shelves), tallest first, with padding pixels
+    between them so smoothscaling or rotating a subsurface never picks up
+    its neighbors. Images bigger than max_image_size on either side, like
+    backgrounds, and palette images aren't accepted.
+    """
+
+    def __init__(self, max_size=1024, max_image_size=256, padding=1):
+        """Create an atlas with nothing in it yet."""
+        self.max_size = max_size
+        self.max_image_size = max_image_size
+        self.padding = padding
+        self.sheets = []
+        self._images = {}
+
+    def __len__(self):
+        """Return the number of images added."""
+        return len(self._images)
+
+    def add(self, key, image):
+        """Ask for an image to be packed. Return false if it can't be."""
+        width, height = image.get_size()
+        if (width > self.max_image_size or height > self.max_image_size or
+            width + self.padding > self.max_size or
+            height + self.padding > self.max_size or
+            image.get_bitsize() <= 8):
+            return False
+
+        self._images[key] = image
+        return True
+
+    def pack(self):
+        """Copy every image onto the sheets and return their subsurfaces.
+
+        The return value is a dictionary of the subsurfaces by key. The
+        sheets made by earlier calls are kept; call pack() once with
+        everything, not after every image.
+        """
+        groups = {}
+        for key, image in self._images.items():
+            groups.setdefault(self._get_format(image), []).append(key)
+
+        subsurfaces = {}
+        for keys in groups.values():
+            keys.sort(key=lambda key: self._images[key].get_height(),
+                      reverse=True)
+            for placements in self._place(keys):
+                subsurfaces.update(self._draw_sheet(placements))
+
+        self._images.clear()
+        return subsurfaces
+
+    def get_stats(self):
+        """Return a dictionary with the number of sheets and their usage."""
+        sheet_area = sum(sheet.get_width() * sheet.get_height()
+                         for sheet in self.sheets)
+        return {
+            'sheets': len(self.sheets),
+            'bytes': sum(sheet.get_pitch() * sheet.get_height()
+                         for sheet in self.sheets),
+            'area': sheet_area,
+        }
+
+    def _place(self, keys):
+        """Work out where each image goes and return a list per sheet.
+
+        Each list holds (key, rect) tuples, with the rects on the sheet.
+        """
+        sheets = []
+        placements = []
+        x = y = shelf_height = 0
+
+        for key in keys:
+            width, height = self._images[key].get_size()
+
+            # Start a new shelf, and a new sheet, when out of room
+            if x + width > self.max_size:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            if y + height > self.max_size:
+                sheets.append(placements)
+                placements = []
+                x = y = shelf_height = 0
+
+            placements.append((key, pygame.Rect(x, y, width, height)))
+            x += width + self.padding
+            shelf_height = max(shelf_height, height + self.padding)
+
+        if placements:
+            sheets.append(placements)
+        return sheets
+
+    def _draw_sheet(self, placements):
+        """Make a sheet with the images placed and return the subsurfaces."""
+        first_image = self._images[placements[0][0]]
+        size = (max(rect.right for key, rect in placements),
+                max(rect.bottom for key, rect in placements))
+        colorkey = first_image.get_colorkey()
+        has_per_pixel_alpha = first_image.get_flags() & pygame.SRCALPHA
+
+        # A new surface takes its pixel format from the image given
+        sheet = pygame.Surface(size, has_per_pixel_alpha, first_image)
+        if colorkey is not None:
+            sheet.fill(colorkey)
+
+        for key, rect in placements:
+            image = self._images[key]
+            if has_per_pixel_alpha:
+                # Copy the alpha instead of blending it with the empty,
+                # fully transparent sheet
+                sheet.blit(image, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                sheet.blit(image, rect)
+
+        if colorkey is not None:
+            sheet.set_colorkey(colorkey)
+        if not has_per_pixel_alpha:
+            sheet.set_alpha(first_image.get_alpha())
+
+        self.sheets.append(sheet)
+        return {key: sheet.subsurface(rect) for key, rect in placements}
+
+    @staticmethod
+    def _get_format(image):
+        """Return what an image must have in common with its sheetmates."""
+        flags = image.get_flags() & pygame.SRCALPHA
+        if flags:
+            alpha = None
+        else:
+            alpha = image.get_alpha()
+        return (image.get_bitsize(), image.get_masks(), flags,
+                image.get_colorkey(), alpha)
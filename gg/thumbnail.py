@@ -23,20 +23,8 @@ class Thumbnail(pygame.sprite.Sprite):
     def __init__(self, group, pos, new_height, image_file, image_dir=None):
         """Initialize the thumbnail."""
         pygame.sprite.Sprite.__init__(self, group)
-        self.image, image_rect = gg.utils._load_image(image_file, image_dir,
-                                                      'a thumbnail')
-
-        aspect_ratio = image_rect.width / image_rect.height
-        new_width = round(new_height * aspect_ratio)
-        new_size = (new_width, new_height)
-
-        # Scale the image
-        try:
-            self.image = pygame.transform.smoothscale(self.image, new_size)
-        except ValueError:
-            self.image = pygame.transform.scale(self.image, new_size)
-
-        self.rect = self.image.get_rect()
+        self.image, self.rect = gg.utils._load_scaled_image(
+            image_file, new_height, image_dir, 'a thumbnail')
         self.rect.topleft = pos
 
     def update(self):
@@ -12,13 +12,28 @@ import os
 import sys
 import pygame
 import gg.colors
+import gg.imagecache
+import gg.textcache
+import gg.textureatlas
 
 _ERR_PREFIX = 'GG ERROR:'
 
+# Every image loaded by the game is kept here after the first time
+_image_cache = gg.imagecache.ImageCache()
 
-def _load_image(file_name, directory=None, dest_object_name=None):
+# Fonts and rendered text are shared the same way
+_text_cache = gg.textcache.TextCache()
+
+
+def _load_image(file_name, directory=None, dest_object_name=None,
+                conversion=gg.imagecache.ImageCache.CONVERT_AUTO):
     """Load an image from the file system and return an image object.
 
+    Images are converted to the display format as dictated by the
+    conversion mode (see ImageCache) and kept in the shared image cache,
+    so asking for the same image again doesn't touch the disk. The image
+    returned is shared, but the rect is always a brand new one.
+
     If an image can't be loaded for any reason (usually because the file
     or folder name specified is misspelled or the file itself is
     missing), return instead a small red square with a white question
@@ -30,6 +45,11 @@ def _load_image(file_name, directory=None, dest_object_name=None):
     article in the string passed, as in "the player" or "a full-screen
     image".
     """
+    cache_key = (directory, file_name, conversion)
+    image = _image_cache.get(cache_key)
+    if image is not None:
+        return (image, image.get_rect())
+
     # Try to load the image through pygame
     try:
         # Check that the file name be valid
@@ -41,13 +61,8 @@ def _load_image(file_name, directory=None, dest_object_name=None):
         else:
             path = os.path.join(directory, file_name)
 
-        image = pygame.image.load(path)
-
-        # If the image has transparency, preserve it
-        if image.get_alpha() is None:
-            image = image.convert()
-        else:
-            image = image.convert_alpha()
+        image = _convert_image(pygame.image.load(path), conversion)
+        _image_cache.put(cache_key, image)
     except RuntimeError as err:
         # If the image can't be loaded, use the Red Square of Doom
         image = _get_square_of_doom()
@@ -65,6 +80,99 @@ def _load_image(file_name, directory=None, dest_object_name=None):
     return (image, image.get_rect())
 
 
+def _load_image_orientations(file_name, directory=None, dest_object_name=None):
+    """Load an image along with its mirror image and return both.
+
+    The return value is a tuple of the images and the rect, where the
+    images are in a tuple indexed by direction: the mirrored image first
+    (facing left), and then the image as drawn (facing right), so that
+    the LEFT and RIGHT constants of Enemy and Player can be used as
+    indices. The mirror image is made only once and kept in the shared
+    image cache, so every sprite using the file gets the same ones.
+    """
+    conversion = gg.imagecache.ImageCache.CONVERT_AUTO
+    image, rect = _load_image(file_name, directory, dest_object_name,
+                              conversion)
+
+    flipped_key = (directory, file_name, (conversion, 'flipped_x'))
+    flipped_image = _image_cache.get(flipped_key)
+
+    if flipped_image is None:
+        flipped_image = pygame.transform.flip(image, True, False)
+
+        # Don't keep the mirror image of the Red Square of Doom
+        if (directory, file_name, conversion) in _image_cache:
+            _image_cache.put(flipped_key, flipped_image)
+
+    return ((flipped_image, image), rect)
+
+
+def _load_scaled_image(file_name, height, directory=None,
+                       dest_object_name=None):
+    """Load an image resized to the height given and return it.
+
+    The aspect ratio is preserved. Scaling is done only once per image
+    and height; the result is kept in the shared image cache.
+    """
+    conversion = gg.imagecache.ImageCache.CONVERT_AUTO
+    image, rect = _load_image(file_name, directory, dest_object_name,
+                              conversion)
+
+    scaled_key = (directory, file_name, (conversion, 'height', height))
+    scaled_image = _image_cache.get(scaled_key)
+
+    if scaled_image is None:
+        aspect_ratio = rect.width / rect.height
+        new_size = (round(height * aspect_ratio), height)
+
+        try:
+            scaled_image = pygame.transform.smoothscale(image, new_size)
+        except ValueError:
+            scaled_image = pygame.transform.scale(image, new_size)
+
+        # Don't keep a scaled Red Square of Doom
+        if (directory, file_name, conversion) in _image_cache:
+            _image_cache.put(scaled_key, scaled_image)
+
+    return (scaled_image, scaled_image.get_rect())
+
+
+def _pack_cached_images(keys):
+    """Move images from the shared image cache onto a texture atlas.
+
+    Each image stored under one of the keys is replaced in the cache by
+    its subsurface on the atlas, so every sprite loading it from then on
+    uses the atlas. Keys that aren't in the cache, and images already on
+    an atlas, are skipped. Return the atlas.
+    """
+    atlas = gg.textureatlas.TextureAtlas()
+    for key in keys:
+        if key in _image_cache:
+            image = _image_cache.get(key)
+            if image.get_parent() is None:
+                atlas.add(key, image)
+
+    for key, image in atlas.pack().items():
+        _image_cache.put(key, image)
+
+    return atlas
+
+
+def _convert_image(image, conversion):
+    """Return the image converted as dictated by the conversion mode."""
+    if conversion == gg.imagecache.ImageCache.CONVERT_NONE:
+        return image
+    elif conversion == gg.imagecache.ImageCache.CONVERT_ALPHA:
+        return image.convert_alpha()
+    elif conversion == gg.imagecache.ImageCache.CONVERT_OPAQUE:
+        return image.convert()
+
+    # If the image has transparency, preserve it
+    if image.get_alpha() is None:
+        return image.convert()
+    return image.convert_alpha()
+
+
 def _blit_text_to_surface(text, surface, text_rect=None, surface_rect=None):
     """Center the text and blit it on the surface."""
     if text_rect is None:
@@ -91,12 +199,34 @@ def _get_surface(size, color=None):
     return (surface, surface.get_rect())
 
 
+def _get_font(size, name=None):
+    """Return the shared font of the given size and name."""
+    return _text_cache.get_font(size, name)
+
+
 def _get_rendered_text(font_obj, text, color):
-    """Return pygame text and its rect."""
-    text = font_obj.render(text, True, color)
+    """Return pygame text and its rect.
+
+    The text surface comes from the shared text cache, so don't draw on
+    it. The rect is always a brand new one.
+    """
+    text = _text_cache.render(font_obj, text, color)
     return (text, text.get_rect())
 
 
+def _wait_for_events(timeout=250):
+    """Sleep until something happens and return the events to handle.
+
+    Unlike polling pygame.event.get() in a loop, waiting uses next to no
+    CPU. If nothing happens within the timeout, in milliseconds, return
+    an empty list so the caller can check on anything else it needs to.
+    """
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
 def _get_square_of_doom():
     """Return a red square surface with a white question mark inside.
 
@@ -105,7 +235,7 @@ def _get_square_of_doom():
     expected.
     """
     square, square_rect = _get_surface((64, 64), gg.colors.RED)
-    font = pygame.font.Font(None, 72)
+    font = _get_font(72)
     text, text_rect = _get_rendered_text(font, '?', gg.colors.WHITE)
     _blit_text_to_surface(text, square, text_rect, square_rect)
     return square